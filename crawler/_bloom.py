@@ -0,0 +1,43 @@
+"""
+Bloom filter for compact, probabilistic membership tests.
+"""
+import hashlib
+import math
+from typing import List, Union
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter backed by a bytearray.
+    May report false positives at roughly the configured error rate,
+    but never false negatives.
+    """
+    
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        """
+        Initialize the Bloom filter.
+        
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive rate once capacity is reached
+        """
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _positions(self, item: Union[str, bytes]) -> List[int]:
+        """Get the bit positions for an item using double hashing."""
+        if isinstance(item, str):
+            item = item.encode('utf-8')
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    def add(self, item: Union[str, bytes]) -> None:
+        """Add an item to the filter."""
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, item: Union[str, bytes]) -> bool:
+        """Check whether an item may have been added."""
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
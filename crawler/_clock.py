@@ -0,0 +1,26 @@
+"""
+Cheap wall-clock timestamps for hot paths.
+"""
+import time
+
+# Formatting the date/time part is the expensive bit, so it is cached per second
+_cached_second = None
+_cached_prefix = ""
+
+def iso_now() -> str:
+    """
+    Get the current local time as an ISO 8601 string.
+    Equivalent to datetime.now().isoformat() but always includes microseconds,
+    and re-formats the date/time part at most once per second.
+    
+    Returns:
+        Current timestamp, e.g. '2024-01-01T12:00:00.000123'
+    """
+    global _cached_second, _cached_prefix
+    
+    now = time.time()
+    second = int(now)
+    if second != _cached_second:
+        _cached_prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(second))
+        _cached_second = second
+    return f"{_cached_prefix}.{int((now - second) * 1_000_000):06d}"
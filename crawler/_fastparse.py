@@ -0,0 +1,98 @@
+"""
+Fast HTML parsing helpers built on lxml.
+Used on hot paths where a full BeautifulSoup tree is not needed.
+"""
+from typing import Iterable, Iterator
+from lxml import etree
+from lxml import html as lxml_html
+
+def parse(html: str) -> lxml_html.HtmlElement:
+    """
+    Parse HTML content into an lxml document tree.
+    
+    Args:
+        html: HTML content to parse
+    
+    Returns:
+        Root <html> element of the parsed document
+    """
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input carrying an XML encoding declaration
+        return lxml_html.document_fromstring(html.encode('utf-8'))
+    except etree.ParserError:
+        # Empty or whitespace-only documents
+        return lxml_html.document_fromstring('<html></html>')
+
+def get_text(element: etree._Element, separator: str = '', strip: bool = True) -> str:
+    """
+    Collect the text of an element, mirroring BeautifulSoup's get_text().
+    
+    Args:
+        element: Element to collect text from
+        separator: String used to join text fragments
+        strip: Whether to strip whitespace and drop empty fragments
+    
+    Returns:
+        Joined text content
+    """
+    if strip:
+        return separator.join(s for s in (t.strip() for t in element.itertext()) if s)
+    return separator.join(element.itertext())
+
+# Text nodes outside script and style elements; comments are never text nodes
+_VISIBLE_TEXT_XPATH = etree.XPath('.//text()[not(parent::script or parent::style)]')
+
+def get_visible_text(element: etree._Element, separator: str = '', strip: bool = True) -> str:
+    """
+    Collect the text of an element, skipping script and style contents.
+    Unlike stripping those elements first, this leaves the tree untouched so
+    it can be shared with other extraction steps.
+    
+    Args:
+        element: Element to collect text from
+        separator: String used to join text fragments
+        strip: Whether to strip whitespace and drop empty fragments
+    
+    Returns:
+        Joined text content
+    """
+    texts = _VISIBLE_TEXT_XPATH(element)
+    if strip:
+        return separator.join(s for s in (t.strip() for t in texts) if s)
+    return separator.join(texts)
+
+def iter_elements(html: str, tags: Iterable[str], chunk_size: int = 65536) -> Iterator[etree._Element]:
+    """
+    Stream the elements with the given tags without keeping the document tree.
+    Each element is yielded once it is complete, so its attributes and text are
+    available, and is discarded as soon as the caller moves on.
+    
+    Args:
+        html: HTML content to parse
+        tags: Tag names of the elements to yield
+        chunk_size: Number of characters fed to the parser at a time
+    
+    Returns:
+        Iterator over matching elements in document order
+    """
+    tags = frozenset(tags)
+    parser = etree.HTMLPullParser(events=('end',))
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        yield from _drain_events(parser, tags)
+    parser.close()
+    yield from _drain_events(parser, tags)
+
+def _drain_events(parser: etree.HTMLPullParser, tags: frozenset) -> Iterator[etree._Element]:
+    """Yield the matching elements parsed so far and free every finished one."""
+    for _, element in parser.read_events():
+        if element.tag in tags:
+            yield element
+        element.clear()
+        # Drop finished siblings so the partial tree stays small
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
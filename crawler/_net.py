@@ -0,0 +1,44 @@
+"""
+Shared HTTP connection pool.
+Lets page requests and media downloads reuse the same keep-alive connections.
+"""
+import asyncio
+import weakref
+import aiohttp
+
+# Pool limits shared by every session in the process
+CONNECTOR_LIMIT = 500
+CONNECTOR_LIMIT_PER_HOST = 8
+DNS_CACHE_TTL = 300  # seconds
+
+# Connectors are bound to an event loop, so keep one per loop
+_connectors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.TCPConnector]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def get_connector() -> aiohttp.TCPConnector:
+    """
+    Get the shared connector for the running event loop.
+    Sessions using it must pass connector_owner=False so that closing one
+    session does not close the pool for the others.
+    
+    Returns:
+        Shared TCP connector
+    """
+    loop = asyncio.get_running_loop()
+    connector = _connectors.get(loop)
+    if connector is None or connector.closed:
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTOR_LIMIT,
+            limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            use_dns_cache=True
+        )
+        _connectors[loop] = connector
+    return connector
+
+async def close_connector() -> None:
+    """Close the shared connector for the running event loop."""
+    connector = _connectors.pop(asyncio.get_running_loop(), None)
+    if connector is not None:
+        await connector.close()
@@ -2,8 +2,8 @@
 Configuration management implementation.
 """
 from typing import Any, Dict
-import json
 import os
+import orjson
 from loguru import logger
 from ..interfaces import IConfigManager
 
@@ -17,6 +17,8 @@ class ConfigManager(IConfigManager):
         """Initialize configuration manager."""
         self.config = {}
         self.config_files = {}
+        # Leaf values of the merged config keyed by dotted path, e.g. "spider.concurrency"
+        self._flat: Dict[str, Any] = {}
     
     def load_config(self, config_path: str) -> Dict[str, Any]:
         """
@@ -30,20 +32,21 @@ class ConfigManager(IConfigManager):
             
         Raises:
             FileNotFoundError: If config file doesn't exist
-            json.JSONDecodeError: If config file is invalid JSON
+            orjson.JSONDecodeError: If config file is invalid JSON
         """
         try:
             if not os.path.exists(config_path):
                 raise FileNotFoundError(f"Config file not found: {config_path}")
             
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            with open(config_path, 'rb') as f:
+                config = orjson.loads(f.read())
             
             self.config.update(config)
             self.config_files[config_path] = config
+            self._rebuild_flat()
             return config
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in config file {config_path}: {e}")
             raise
         except Exception as e:
@@ -70,12 +73,14 @@ class ConfigManager(IConfigManager):
                 current_config = new_config
             
             # Write to file
-            with open(config_path, 'w') as f:
-                json.dump(current_config, f, indent=2)
+            # Config files are edited by hand, so keep them indented
+            with open(config_path, 'wb') as f:
+                f.write(orjson.dumps(current_config, option=orjson.OPT_INDENT_2))
             
             # Update internal state
             self.config_files[config_path] = current_config
             self.config.update(new_config)
+            self._rebuild_flat()
             
             return True
             
@@ -88,9 +93,24 @@ class ConfigManager(IConfigManager):
         Get configuration value.
         
         Args:
-            key: Configuration key to retrieve
+            key: Configuration key to retrieve; nested values can be
+                addressed with a dotted path such as "spider.concurrency"
             
         Returns:
             Configuration value or None if not found
         """
-        return self.config.get(key)
+        return self._flat.get(key, self.config.get(key))
+    
+    def _rebuild_flat(self) -> None:
+        """Rebuild the dotted-path lookup table from the merged config."""
+        self._flat = {}
+        self._flatten(self.config, '')
+    
+    def _flatten(self, config: Dict[str, Any], prefix: str) -> None:
+        """Add the leaf values of a config section to the lookup table."""
+        for key, value in config.items():
+            path = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, dict):
+                self._flatten(value, path)
+            else:
+                self._flat[path] = value
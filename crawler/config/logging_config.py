@@ -6,12 +6,16 @@ import sys
 from datetime import datetime
 from loguru import logger
 
-def setup_logging(name: str = "quant_crawler") -> None:
+def setup_logging(name: str = "quant_crawler", console_level: str = "INFO",
+                  file_level: str = "DEBUG") -> None:
     """
     Set up logging configuration.
     
     Args:
         name: Name prefix for log files
+        console_level: Minimum level written to the console
+        file_level: Minimum level written to the log file; raising it lets
+            production runs skip formatting debug records entirely
     """
     # Remove default handler
     logger.remove()
@@ -25,20 +29,23 @@ def setup_logging(name: str = "quant_crawler") -> None:
     log_file = os.path.join(log_dir, f"{name}_{timestamp}.log")
     
     # Add handlers
-    # Console handler - INFO level
+    # Console handler - INFO level by default
     logger.add(
         sys.stdout,
         format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level="INFO"
+        level=console_level
     )
     
-    # File handler - DEBUG level
+    # File handler - DEBUG level by default
     logger.add(
         log_file,
         format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="DEBUG",
+        level=file_level,
         rotation="100 MB",  # Rotate when file reaches 100MB
-        retention="30 days"  # Keep logs for 30 days
+        retention="30 days",  # Keep logs for 30 days
+        enqueue=True,  # Write from a background thread, off the event loop
+        backtrace=False,
+        diagnose=False
     )
     
     logger.info(f"Logging configured. Log file: {log_file}")
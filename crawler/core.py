@@ -4,10 +4,12 @@ This module provides concrete implementations of the interfaces defined in inter
 Each class implements specific functionality while maintaining loose coupling.
 """
 import asyncio
+import contextlib
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlsplit
 import aiohttp
-from bs4 import BeautifulSoup
+from lxml import etree
 from loguru import logger
 
 from .interfaces import (
@@ -18,6 +20,28 @@ from .interfaces import (
     IMonitor
 )
 from .crawler_core.content_analyzer import ContentAnalyzer
+from .crawler_core.rate_limiter import RateLimiter
+from ._fastparse import parse as parse_html, get_text, get_visible_text
+from ._net import get_connector
+
+def _class_xpath(*class_names: str) -> etree.XPath:
+    """Compile an XPath matching elements that have any of the given CSS classes."""
+    conditions = ' or '.join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in class_names
+    )
+    return etree.XPath(f"descendant-or-self::*[{conditions}]")
+
+# Pagination element classes mapped to their pagination keys (adjust selectors)
+_PAGINATION_CLASSES = {
+    'current-page': 'current_page',
+    'total-pages': 'total_pages',
+    'next-page': 'next_page'
+}
+
+# Selectors are compiled once at import and reused for every page
+_ITEM_XPATH = _class_xpath('item')  # Adjust selector based on actual HTML
+_ITEM_LINKS_XPATH = etree.XPath('.//a/@href')
+_PAGINATION_XPATH = _class_xpath(*_PAGINATION_CLASSES)
 
 class RequestManager(IRequestManager):
     """
@@ -27,10 +51,12 @@ class RequestManager(IRequestManager):
     
     def __init__(self):
         """Initialize RequestManager with default settings."""
-        self.session = aiohttp.ClientSession()
+        self.session: Optional[aiohttp.ClientSession] = None
         self.proxy = None
         self.max_retries = 3
         self.delay = 1
+        # Per-host request rates, so concurrent crawls stay polite to each site
+        self.rate_limiter = RateLimiter()
         
     async def make_request(self, url: str, method: str = "GET",
                           headers: Optional[Dict[str, str]] = None, cookies: Optional[Dict[str, str]] = None) -> str:
@@ -49,7 +75,12 @@ class RequestManager(IRequestManager):
         Raises:
             Exception: If all retry attempts fail
         """
+        if not self.session:
+            self.session = aiohttp.ClientSession(connector=get_connector(), connector_owner=False)
+            
+        domain = urlsplit(url).netloc
         for attempt in range(self.max_retries):
+            await self.rate_limiter.acquire(domain)
             try:
                 async with self.session.request(
                     method, url, headers=headers, cookies=cookies, proxy=self.proxy
@@ -68,6 +99,13 @@ class RequestManager(IRequestManager):
         """Configure retry policy for failed requests."""
         self.max_retries = max_retries
         self.delay = delay
+    
+    def set_rate_limit(self, domain: Optional[str], requests_per_second: float) -> None:
+        """Limit how often requests are sent to a host; None sets the default for every host."""
+        if domain is None:
+            self.rate_limiter.default_rate = requests_per_second
+        else:
+            self.rate_limiter.update_rate(domain, requests_per_second)
 
     async def close(self):
         """Close the session."""
@@ -80,10 +118,17 @@ class Spider(ISpider):
     Core spider implementation for crawling web pages.
     """
     
-    def __init__(self, request_manager: IRequestManager):
-        """Initialize spider with request manager."""
+    def __init__(self, request_manager: IRequestManager, keep_raw: bool = False):
+        """
+        Initialize spider with request manager.
+        
+        Args:
+            request_manager: Request manager used for fetching pages
+            keep_raw: Include the raw HTML in parse results as 'raw_html'
+        """
         self.request_manager = request_manager
         self.content_analyzer = ContentAnalyzer()
+        self.keep_raw = keep_raw
     
     async def crawl(self, url: str) -> Dict[str, Any]:
         """
@@ -102,68 +147,65 @@ class Spider(ISpider):
             logger.error(f"Error crawling {url}: {str(e)}")
             raise
     
-    async def parse(self, content: str) -> Dict[str, Any]:
+    async def parse(self, content: Union[str, etree._Element]) -> Dict[str, Any]:
         """
         Parse HTML content and extract data.
         
         Args:
-            content: HTML content to parse
+            content: HTML content to parse, or a document already parsed with lxml
             
         Returns:
             Dict containing parsed data
         """
         try:
-            soup = BeautifulSoup(content, 'lxml')
+            root = parse_html(content) if isinstance(content, str) else content
             
             # Extract list items
             list_items = []
-            for item in soup.select('.item'):  # Adjust selector based on actual HTML
+            for item in _ITEM_XPATH(root):
                 item_data = {
-                    'text': item.get_text(strip=True),
-                    'links': [a.get('href') for a in item.select('a[href]')],
-                    'html': str(item)
+                    'text': get_text(item),
+                    'links': [str(href) for href in _ITEM_LINKS_XPATH(item)],
+                    'html': etree.tostring(item, encoding='unicode', with_tail=False)
                 }
                 list_items.append(item_data)
             
             # Extract pagination info
-            pagination = {
-                'current_page': self._extract_current_page(soup),
-                'total_pages': self._extract_total_pages(soup),
-                'next_page': self._extract_next_page(soup)
-            }
+            pagination = self._extract_pagination(root)
             
-            return {
+            result = {
                 'list_items': list_items,
-                'pagination': pagination,
-                'raw_html': content
+                'pagination': pagination
             }
         except Exception as e:
             logger.error(f"Error parsing content: {str(e)}")
-            return {'list_items': [], 'pagination': {}, 'raw_html': content}
-    
-    def _extract_current_page(self, soup: BeautifulSoup) -> int:
-        """Extract current page number."""
-        try:
-            page_elem = soup.select_one('.current-page')  # Adjust selector
-            return int(page_elem.text) if page_elem else 1
-        except:
-            return 1
-    
-    def _extract_total_pages(self, soup: BeautifulSoup) -> int:
-        """Extract total number of pages."""
-        try:
-            total_elem = soup.select_one('.total-pages')  # Adjust selector
-            return int(total_elem.text) if total_elem else 1
-        except:
-            return 1
+            result = {'list_items': [], 'pagination': {}}
+        
+        # Raw HTML is usually larger than everything extracted, so only keep it on request
+        if self.keep_raw:
+            result['raw_html'] = (
+                content if isinstance(content, str) else etree.tostring(content, encoding='unicode')
+            )
+        return result
     
-    def _extract_next_page(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract next page URL."""
-        try:
-            next_link = soup.select_one('.next-page')  # Adjust selector
-            return next_link.get('href') if next_link else None
-        except:
-            return None
+    def _extract_pagination(self, root: etree._Element) -> Dict[str, Any]:
+        """Extract current page, total pages and next page URL in one pass."""
+        pagination = {'current_page': 1, 'total_pages': 1, 'next_page': None}
+        found = set()
+        
+        for elem in _PAGINATION_XPATH(root):
+            classes = elem.get('class', '').split()
+            for class_name, key in _PAGINATION_CLASSES.items():
+                if key in found or class_name not in classes:
+                    continue
+                found.add(key)
+                if key == 'next_page':
+                    pagination[key] = elem.get('href')
+                else:
+                    with contextlib.suppress(ValueError):
+                        pagination[key] = int(elem.text_content())
+        
+        return pagination
 
 class DataProcessor(IDataProcessor):
     """
@@ -171,10 +213,22 @@ class DataProcessor(IDataProcessor):
     Handles text extraction, classification, and storage.
     """
     
-    def extract_text(self, html: str) -> str:
-        """Extract clean text from HTML using BeautifulSoup."""
-        soup = BeautifulSoup(html, 'html.parser')
-        return soup.get_text()
+    def parse_html(self, html: str) -> etree._Element:
+        """
+        Parse HTML once so the tree can be shared by every processing step.
+        
+        Args:
+            html: HTML content to parse
+            
+        Returns:
+            Root element of the parsed document
+        """
+        return parse_html(html)
+    
+    def extract_text(self, html: Union[str, etree._Element]) -> str:
+        """Extract text from HTML, or from a tree returned by parse_html, skipping scripts and styles."""
+        root = parse_html(html) if isinstance(html, str) else html
+        return get_visible_text(root, strip=False)
     
     def classify(self, content: str) -> str:
         """
@@ -3,16 +3,22 @@ Content analyzer for automatically identifying important content patterns on web
 Uses various heuristics and machine learning techniques to identify valuable content.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass
-from bs4 import BeautifulSoup, Tag
-from collections import Counter
+from collections import OrderedDict
+import hashlib
 import re
+from lxml import etree
 from loguru import logger
+from .._fastparse import parse
 
 @dataclass
 class ContentPattern:
     """Data class for storing content pattern information."""
+    # Pages produce thousands of patterns, so avoid a per-instance __dict__;
+    # spelled out rather than dataclass(slots=True) to support Python 3.8
+    __slots__ = ('selector', 'content_type', 'importance_score', 'features')
+    
     selector: str  # CSS selector or XPath
     content_type: str  # article, list, pagination, etc.
     importance_score: float  # 0-1 score indicating importance
@@ -29,6 +35,18 @@ class ContentAnalyzer:
     LIST_KEYWORDS = {'list', 'feed', 'items', 'cards', 'grid'}
     NAVIGATION_KEYWORDS = {'nav', 'menu', 'pagination', 'pages'}
     
+    # Semantic HTML5 elements and their base importance scores
+    SEMANTIC_ELEMENTS = {
+        'article': 0.9,
+        'main': 0.8,
+        'section': 0.7,
+        'nav': 0.6,
+        'aside': 0.4
+    }
+    
+    # Number of analyzed pages whose results are kept for identical HTML
+    RESULT_CACHE_SIZE = 256
+    
     # Content type definitions
     CONTENT_TYPES = {
         'article': {'article', 'post', 'content', 'main-content', 'detail'},
@@ -37,97 +55,160 @@ class ContentAnalyzer:
         'comments': {'comments', 'responses', 'replies'},
         'sidebar': {'sidebar', 'related', 'recommended'}
     }
+    
+    # Reverse index from class keyword to its content type
+    _KEYWORD_TO_TYPE = {
+        keyword: content_type
+        for content_type, keywords in CONTENT_TYPES.items()
+        for keyword in keywords
+    }
 
     def __init__(self):
         """Initialize the content analyzer."""
         self.patterns: List[ContentPattern] = []
         self.important_selectors: Set[str] = set()
+        # Per-page caches keyed by element; holding the element keeps lxml
+        # returning the same proxy for it, so the keys stay valid
+        self._path_cache: Dict[etree._Element, str] = {}
+        self._position_cache: Dict[etree._Element, int] = {}
+        # Sorted results of recent pages, keyed by a hash of their HTML
+        self._result_cache: "OrderedDict[bytes, List[ContentPattern]]" = OrderedDict()
 
-    def analyze_page(self, html: str) -> List[ContentPattern]:
+    def analyze_page(self, html: Union[str, etree._Element]) -> List[ContentPattern]:
         """
         Analyze a webpage and identify important content patterns.
         
         Args:
-            html: Raw HTML content of the page
+            html: Raw HTML content of the page, or a document already parsed
+                with lxml, which is analyzed without re-parsing
             
         Returns:
-            List of identified content patterns
+            List of identified content patterns. Raw HTML seen recently is
+            answered from a cache, sharing the pattern objects of the first
+            analysis, so they should be treated as read-only.
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        key = None
+        if isinstance(html, str):
+            # Re-crawled pages often come back byte-for-byte identical
+            key = hashlib.blake2b(html.encode('utf-8'), digest_size=16).digest()
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                self._result_cache.move_to_end(key)
+                self.patterns = list(cached)
+                return list(cached)
+            root = parse(html)
+        else:
+            root = html
         self.patterns = []
         
-        # Analyze page structure
-        self._analyze_structure(soup)
-        # Identify content areas
-        self._identify_content_areas(soup)
-        # Analyze text density
-        self._analyze_text_density(soup)
-        # Find repeated patterns
-        self._find_repeated_patterns(soup)
+        # Structure, content areas, text density and repeated patterns are
+        # all collected in a single walk over the document
+        try:
+            self._collect_patterns(root)
+        finally:
+            # Release the page's elements once its selectors are built
+            self._path_cache.clear()
+            self._position_cache.clear()
         # Score patterns
         self._score_patterns()
         
-        return sorted(self.patterns, key=lambda x: x.importance_score, reverse=True)
+        result = sorted(self.patterns, key=lambda x: x.importance_score, reverse=True)
+        if key is not None:
+            self._result_cache[key] = result
+            if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return list(result)
 
-    def _analyze_structure(self, soup: BeautifulSoup) -> None:
-        """Analyze the overall structure of the page."""
-        # Look for semantic HTML5 elements
-        semantic_elements = {
-            'article': 0.9,
-            'main': 0.8,
-            'section': 0.7,
-            'nav': 0.6,
-            'aside': 0.4
-        }
+    def _collect_patterns(self, root: etree._Element) -> None:
+        """
+        Walk the document once and collect every kind of pattern.
+        Patterns are appended grouped by kind, each group in document order.
         
-        for element, base_score in semantic_elements.items():
-            for tag in soup.find_all(element):
-                self.patterns.append(ContentPattern(
-                    selector=self._get_unique_selector(tag),
-                    content_type=element,
-                    importance_score=base_score,
-                    features={'semantic': True}
-                ))
-
-    def _identify_content_areas(self, soup: BeautifulSoup) -> None:
-        """Identify main content areas using various heuristics."""
-        # Check common content IDs and classes
-        for element in soup.find_all(class_=True):
-            classes = set(element.get('class', []))
-            for content_type, keywords in self.CONTENT_TYPES.items():
-                if keywords & classes:
-                    self.patterns.append(ContentPattern(
+        Args:
+            root: Parsed page document
+        """
+        structure = []
+        content_areas = []
+        # Density patterns get a slot on entering an element and are filled
+        # in on leaving it, once the whole subtree has been measured
+        density_slots = []
+        pattern_counts: Dict[str, int] = {}
+        # One [text length, tag count, density slot] frame per open element
+        stack = [[0, 0, None]]
+        
+        for event, element in etree.iterwalk(root, events=('start', 'end')):
+            if event == 'start':
+                tag = element.tag
+                
+                # Semantic HTML5 elements
+                base_score = self.SEMANTIC_ELEMENTS.get(tag)
+                if base_score is not None:
+                    structure.append(ContentPattern(
                         selector=self._get_unique_selector(element),
-                        content_type=content_type,
-                        importance_score=0.7,
-                        features={'matched_keywords': keywords & classes}
+                        content_type=tag,
+                        importance_score=base_score,
+                        features={'semantic': True}
                     ))
-
-    def _analyze_text_density(self, soup: BeautifulSoup) -> None:
-        """Analyze text density to identify content-rich areas."""
-        for element in soup.find_all(['div', 'article', 'section']):
-            text_length = len(element.get_text(strip=True))
-            tags_count = len(element.find_all())
-            if tags_count > 0:
+                
+                # Common content classes
+                class_attr = element.get('class')
+                if class_attr:
+                    matched = {}
+                    for class_name in class_attr.split():
+                        content_type = self._KEYWORD_TO_TYPE.get(class_name)
+                        if content_type is not None:
+                            matched.setdefault(content_type, set()).add(class_name)
+                    if matched:
+                        selector = self._get_unique_selector(element)
+                        # One pattern per matched type, in CONTENT_TYPES order
+                        for content_type in self.CONTENT_TYPES:
+                            if content_type in matched:
+                                content_areas.append(ContentPattern(
+                                    selector=selector,
+                                    content_type=content_type,
+                                    importance_score=0.7,
+                                    features={'matched_keywords': matched[content_type]}
+                                ))
+                
+                # Similar structures that repeat
+                if tag in ('div', 'li', 'article'):
+                    pattern = self._get_element_pattern(element)
+                    if pattern:
+                        pattern_counts[pattern] = pattern_counts.get(pattern, 0) + 1
+                
+                slot = None
+                if tag in ('div', 'article', 'section'):
+                    slot = len(density_slots)
+                    density_slots.append(None)
+                stack.append([0, 0, slot])
+                continue
+            
+            # Leaving the element: add its own text and its children's tails,
+            # matching get_text(), then hand the totals to the parent
+            text_length, tags_count, slot = stack.pop()
+            if element.text:
+                text_length += len(element.text.strip())
+            for child in element:
+                if child.tail:
+                    text_length += len(child.tail.strip())
+            parent = stack[-1]
+            parent[0] += text_length
+            parent[1] += tags_count + 1
+            
+            # Text-dense content areas
+            if slot is not None and tags_count > 0:
                 density = text_length / tags_count
                 if density > 50:  # High text density threshold
-                    self.patterns.append(ContentPattern(
+                    density_slots[slot] = ContentPattern(
                         selector=self._get_unique_selector(element),
                         content_type='content',
                         importance_score=min(0.9, density / 1000),
                         features={'text_density': density}
-                    ))
-
-    def _find_repeated_patterns(self, soup: BeautifulSoup) -> None:
-        """Identify repeated patterns that might indicate lists or feeds."""
-        # Look for similar structures that repeat
-        pattern_counts = Counter()
-        
-        for element in soup.find_all(['div', 'li', 'article']):
-            pattern = self._get_element_pattern(element)
-            if pattern:
-                pattern_counts[pattern] += 1
+                    )
         
+        self.patterns.extend(structure)
+        self.patterns.extend(content_areas)
+        self.patterns.extend(pattern for pattern in density_slots if pattern is not None)
         for pattern, count in pattern_counts.items():
             if count > 2:  # Minimum repetition threshold
                 self.patterns.append(ContentPattern(
@@ -153,37 +234,72 @@ class ContentAnalyzer:
             # Cap score at 1.0
             pattern.importance_score = min(1.0, pattern.importance_score)
 
-    def _get_unique_selector(self, tag: Tag) -> str:
+    def _get_unique_selector(self, tag: etree._Element) -> str:
         """Generate a unique CSS selector for a tag."""
         if tag.get('id'):
-            return f"#{tag['id']}"
+            return f"#{tag.get('id')}"
         
-        if tag.get('class'):
-            classes = '.'.join(tag['class'])
-            return f"{tag.name}.{classes}"
+        classes = tag.get('class', '').split()
+        if classes:
+            return f"{tag.tag}.{'.'.join(classes)}"
         
         # Generate path if no id/class
-        path = []
-        parent = tag
-        while parent and parent.name != '[document]':
-            if parent.get('id'):
-                path.append(f"#{parent['id']}")
+        return self._get_element_path(tag)
+
+    def _get_element_path(self, element: etree._Element) -> str:
+        """
+        Build the nth-of-type path of an element, anchored at the nearest ancestor with an id.
+        Paths are cached, so elements sharing ancestors only build the new part.
+        
+        Args:
+            element: Element to build the path for
+            
+        Returns:
+            CSS selector path of the element
+        """
+        # Walk up to the nearest ancestor whose path is known or has an id
+        pending = []
+        path = None
+        node = element
+        while node is not None:
+            path = self._path_cache.get(node)
+            if path is not None:
                 break
-            siblings = parent.find_previous_siblings(parent.name)
-            path.append(f"{parent.name}:nth-of-type({len(siblings) + 1})")
-            parent = parent.parent
+            if node.get('id'):
+                path = self._path_cache[node] = f"#{node.get('id')}"
+                break
+            pending.append(node)
+            node = node.getparent()
         
-        return ' > '.join(reversed(path))
+        # Extend that path back down to the element, caching each step
+        for node in reversed(pending):
+            step = f"{node.tag}:nth-of-type({self._get_position(node)})"
+            path = self._path_cache[node] = step if path is None else f"{path} > {step}"
+        return path
+
+    def _get_position(self, element: etree._Element) -> int:
+        """Get the 1-based position of an element among its siblings with the same tag."""
+        position = self._position_cache.get(element)
+        if position is None:
+            parent = element.getparent()
+            if parent is None:
+                return 1
+            # Number every child of the parent in one pass
+            counts = {}
+            for child in parent:
+                count = counts[child.tag] = counts.get(child.tag, 0) + 1
+                self._position_cache[child] = count
+            position = self._position_cache[element]
+        return position
 
-    def _get_element_pattern(self, element: Tag) -> Optional[str]:
+    def _get_element_pattern(self, element: etree._Element) -> Optional[str]:
         """Get a simplified pattern representation of an element's structure."""
-        if not element.name:
+        if not isinstance(element.tag, str):
             return None
         
-        pattern = [element.name]
-        for child in element.children:
-            if isinstance(child, Tag):
-                pattern.append(child.name)
+        pattern = [element.tag]
+        for child in element.iterchildren(etree.Element):
+            pattern.append(child.tag)
         
         return ','.join(pattern) if pattern else None
 
@@ -2,29 +2,45 @@
 Rate limiter for controlling request rates.
 """
 import asyncio
-from datetime import datetime
-from typing import Dict
+import time
+from typing import Dict, List, Optional
 from ..interfaces import IRateLimiter
 
 class RateLimiter(IRateLimiter):
-    """Controls request rates per domain."""
+    """Controls request rates per domain using a token bucket."""
     
-    def __init__(self):
-        self.rates = {}  # domain -> requests per second
-        self.last_request = {}  # domain -> last request time
+    def __init__(self, burst: float = 1.0, default_rate: Optional[float] = None):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            burst: Maximum number of requests allowed back-to-back per domain
+            default_rate: Requests per second for domains without their own
+                rate, or None to leave them unlimited
+        """
+        self.burst = burst
+        self.default_rate = default_rate
+        self.rates: Dict[str, float] = {}  # domain -> requests per second
+        self.buckets: Dict[str, List[float]] = {}  # domain -> [tokens, last refill time]
     
     async def acquire(self, domain: str) -> bool:
         """Check if request is allowed for domain."""
-        if domain not in self.rates:
+        rate = self.rates.get(domain, self.default_rate)
+        if not rate:
             return True
         
-        now = datetime.now()
-        if domain in self.last_request:
-            time_diff = (now - self.last_request[domain]).total_seconds()
-            if time_diff < 1.0 / self.rates[domain]:
-                await asyncio.sleep(1.0 / self.rates[domain] - time_diff)
+        now = time.monotonic()
+        bucket = self.buckets.get(domain)
+        if bucket is None:
+            bucket = self.buckets[domain] = [self.burst, now]
+        
+        # Refill, then reserve a token; a negative balance means waiting for it
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * rate) - 1
+        bucket[0] = tokens
+        bucket[1] = now
+        if tokens < 0:
+            await asyncio.sleep(-tokens / rate)
         
-        self.last_request[domain] = now
         return True
     
     def update_rate(self, domain: str, requests_per_second: float) -> None:
@@ -4,17 +4,31 @@ Request manager module for handling HTTP requests.
 import asyncio
 from typing import Dict, Optional
 import aiohttp
+from charset_normalizer import from_bytes
 from loguru import logger
+from .._net import get_connector
 from ..interfaces import IRequestManager
 
 class RequestManager(IRequestManager):
     """Request manager implementation."""
     
-    def __init__(self, max_retries: int = 3, delay: int = 1):
-        """Initialize request manager."""
+    # Socket read buffer size for response bodies
+    READ_BUFSIZE = 65536
+    
+    def __init__(self, max_retries: int = 3, delay: int = 1, session: Optional[aiohttp.ClientSession] = None):
+        """
+        Initialize request manager.
+        
+        Args:
+            max_retries: Maximum number of attempts per request
+            delay: Base delay between retries in seconds
+            session: Optional session to share with other components; it is
+                left open by close(), since its owner is responsible for it
+        """
         self.max_retries = max_retries
         self.delay = delay
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -37,17 +51,20 @@ class RequestManager(IRequestManager):
         """
         try:
             if not self._session:
-                self._session = aiohttp.ClientSession(headers=self.headers)
+                self._session = aiohttp.ClientSession(
+                    headers=self.headers, connector=get_connector(), connector_owner=False
+                )
             
-            merged_headers = self.headers.copy()
-            if headers:
-                merged_headers.update(headers)
+            # Only copy the default headers when there is something to merge
+            merged_headers = {**self.headers, **headers} if headers else self.headers
                 
             for attempt in range(self.max_retries):
                 try:
-                    async with self._session.request(method, url, headers=merged_headers, proxy=self.proxy) as response:
+                    async with self._session.request(
+                        method, url, headers=merged_headers, proxy=self.proxy, read_bufsize=self.READ_BUFSIZE
+                    ) as response:
                         if response.status == 200:
-                            return await response.text()
+                            return self._decode_body(await response.read(), response.charset)
                         else:
                             logger.warning(f"Request failed with status {response.status}")
                             if attempt < self.max_retries - 1:
@@ -66,6 +83,29 @@ class RequestManager(IRequestManager):
             logger.error(f"Error making request to {url}: {e}")
             raise
     
+    @staticmethod
+    def _decode_body(body: bytes, charset: Optional[str]) -> str:
+        """
+        Decode a response body.
+        
+        Uses the declared charset (UTF-8 if none) and only falls back to
+        charset detection when that fails, instead of probing every response.
+        
+        Args:
+            body: Raw response body
+            charset: Charset from the Content-Type header, if any
+            
+        Returns:
+            Decoded response text
+        """
+        try:
+            return body.decode(charset or 'utf-8')
+        except (UnicodeDecodeError, LookupError):
+            best = from_bytes(body).best()
+            if best is not None:
+                return str(best)
+            return body.decode('utf-8', errors='replace')
+    
     def set_proxy(self, proxy: str) -> None:
         """
         Set proxy for HTTP requests.
@@ -87,8 +127,8 @@ class RequestManager(IRequestManager):
         self.delay = delay
     
     async def close(self):
-        """Close the session."""
-        if self._session:
+        """Close the session, unless it was passed in by the caller."""
+        if self._session and self._owns_session:
             await self._session.close()
             self._session = None
     
@@ -2,19 +2,48 @@
 Spider module for web crawling.
 """
 import re
+import asyncio
 from typing import Dict, Any, Optional, List, Callable
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-from datetime import datetime
+from .._clock import iso_now
+from .._bloom import BloomFilter
+from .._fastparse import parse as parse_html, get_text
 from ..interfaces import ISpider
 from .request_manager import RequestManager
 
 class Spider(ISpider):
     """Spider implementation for web crawling."""
     
-    def __init__(self, request_manager: RequestManager):
-        """Initialize spider with request manager."""
+    URL_PATTERN = re.compile(
+        r'^https?://'  # http:// or https://
+        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+        r'localhost|'  # localhost...
+        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+        r'(?::\d+)?'  # optional port
+        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+    
+    # Maximum number of links returned by parse()
+    MAX_LINKS = 100
+    
+    # Markup, digits and whitespace are ignored when fingerprinting content,
+    # so pages differing only in timestamps or counters are treated as duplicates
+    CONTENT_NOISE_PATTERN = re.compile(r'<[^>]+>|[\d\s]+')
+    
+    def __init__(self, request_manager: RequestManager, concurrency: int = 50,
+                 dedupe_content: bool = False):
+        """
+        Initialize spider with request manager.
+        
+        Args:
+            request_manager: Request manager used for fetching pages
+            concurrency: Maximum number of concurrent crawls
+            dedupe_content: Skip parsing pages whose content was already seen
+        """
         self.request_manager = request_manager
+        self.concurrency = concurrency
+        # Created on first use, inside the loop that runs the crawls
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._seen_content = BloomFilter() if dedupe_content else None
     
     async def crawl(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
@@ -36,7 +65,15 @@ class Spider(ISpider):
             
         try:
             html = await self.request_manager.make_request(url, headers=headers)
-            timestamp = datetime.now().isoformat()
+            timestamp = iso_now()
+            
+            if self._is_duplicate(html):
+                return {
+                    'url': url,
+                    'html': html,
+                    'timestamp': timestamp,
+                    'duplicate': True
+                }
             
             return {
                 'url': url,
@@ -70,44 +107,90 @@ class Spider(ISpider):
             List of dictionaries containing page content and metadata
         """
         results = []
+        end_page = start_page + max_pages
+        if start_page >= end_page:
+            return results
+        
         current_page = start_page
+        next_fetch = asyncio.ensure_future(
+            self._bounded_crawl(self._build_page_url(base_url, page_param, current_page))
+        )
         
-        while current_page < start_page + max_pages:
-            # Construct page URL
-            if "?" in base_url:
-                page_url = f"{base_url}&{page_param}={current_page}"
-            else:
-                page_url = f"{base_url}?{page_param}={current_page}"
-                
-            try:
-                # Crawl current page
-                page_content = await self.crawl(page_url)
-                if not page_content:
-                    break
-                    
-                # Parse URLs from current page
-                urls = page_parser(page_content['html'])
-                if not urls:
-                    break
+        try:
+            while current_page < end_page:
+                page_fetch, next_fetch = next_fetch, None
+                try:
+                    # Crawl current page
+                    page_content = await page_fetch
+                    if not page_content or page_content.get('duplicate'):
+                        break
+                        
+                    # Parse URLs from current page
+                    urls = page_parser(page_content['html'])
+                    if not urls:
+                        break
                     
-                # Crawl individual URLs from current page
-                for url in urls:
-                    try:
-                        content = await self.crawl(url)
-                        if content:
+                    # Prefetch the next page while this page's URLs are crawled
+                    if current_page + 1 < end_page:
+                        next_fetch = asyncio.ensure_future(
+                            self._bounded_crawl(self._build_page_url(base_url, page_param, current_page + 1))
+                        )
+                        
+                    # Crawl individual URLs from current page concurrently
+                    contents = await asyncio.gather(
+                        *(self._bounded_crawl(url) for url in urls),
+                        return_exceptions=True
+                    )
+                    for url, content in zip(urls, contents):
+                        if isinstance(content, Exception):
+                            print(f"Error crawling {url}: {content}")
+                        elif content and not content.get('duplicate'):
                             results.append(content)
-                    except Exception as e:
-                        print(f"Error crawling {url}: {e}")
-                        continue
-                
-                current_page += 1
-                
-            except Exception as e:
-                print(f"Error crawling page {current_page}: {e}")
-                break
-                
+                    
+                    current_page += 1
+                    
+                except Exception as e:
+                    print(f"Error crawling page {current_page}: {e}")
+                    break
+            
+        finally:
+            if next_fetch is not None:
+                # Also retrieve the outcome of a prefetch that already failed,
+                # so its exception is not reported as never retrieved
+                next_fetch.cancel()
+                await asyncio.gather(next_fetch, return_exceptions=True)
+        
         return results
     
+    def _is_duplicate(self, html: str) -> bool:
+        """Check and record the content fingerprint of a page."""
+        if self._seen_content is None:
+            return False
+        
+        fingerprint = self.CONTENT_NOISE_PATTERN.sub('', html)
+        if fingerprint in self._seen_content:
+            return True
+        self._seen_content.add(fingerprint)
+        return False
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent crawls, shared by all calls."""
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+        return self._sem
+    
+    async def _bounded_crawl(self, url: str) -> Dict[str, Any]:
+        """Crawl a URL while holding the concurrency semaphore."""
+        async with self._get_semaphore():
+            return await self.crawl(url)
+    
+    @staticmethod
+    def _build_page_url(base_url: str, page_param: str, page: int) -> str:
+        """Construct the URL for a given page number."""
+        if "?" in base_url:
+            return f"{base_url}&{page_param}={page}"
+        return f"{base_url}?{page_param}={page}"
+    
     async def parse(self, html: str) -> Dict[str, Any]:
         """
         Parse HTML content and extract structured data.
@@ -118,33 +201,35 @@ class Spider(ISpider):
         Returns:
             Dictionary containing parsed data
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Extract basic page information
-        title = soup.title.string if soup.title else ""
-        
-        # Extract meta tags
+        root = parse_html(html)
+        title = None
         meta_tags = {}
-        for meta in soup.find_all('meta'):
-            name = meta.get('name', '')
-            content = meta.get('content', '')
-            if name and content:
-                meta_tags[name] = content
-                
-        # Extract links
         links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            text = link.get_text(strip=True)
-            links.append({
-                'url': href,
-                'text': text
-            })
+        
+        # Collect title, meta tags and links in a single walk of the tree
+        for elem in root.iter('title', 'meta', 'a'):
+            tag = elem.tag
+            if tag == 'a':
+                if len(links) >= self.MAX_LINKS:
+                    continue
+                href = elem.get('href')
+                if href is not None:
+                    links.append({
+                        'url': href,
+                        'text': get_text(elem)
+                    })
+            elif tag == 'meta':
+                name = elem.get('name', '')
+                content = elem.get('content', '')
+                if name and content:
+                    meta_tags[name] = content
+            elif title is None:
+                title = elem.text or ""
             
         return {
-            'title': title,
+            'title': title or "",
             'meta_tags': meta_tags,
-            'links': links[:100]  # Limit to first 100 links
+            'links': links
         }
 
     def validate_url(self, url: str) -> bool:
@@ -157,12 +242,4 @@ class Spider(ISpider):
         Returns:
             True if URL is valid, False otherwise
         """
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        
-        return url_pattern.match(url) is not None
+        return self.URL_PATTERN.match(url) is not None
@@ -2,21 +2,42 @@
 Content extraction implementation.
 """
 import os
+import asyncio
+import contextlib
 import aiohttp
 import aiofiles
-from typing import Dict, Any, List, Optional, Union
-from bs4 import BeautifulSoup
+from typing import Dict, Any, List, Optional, Tuple, Union
+from lxml import etree
 from loguru import logger
 from PIL import Image
-from io import BytesIO
 from urllib.parse import urljoin, urlparse
+from .._net import get_connector
+from .._fastparse import parse as parse_html, get_text, get_visible_text
 from ..interfaces import IContentExtractor
 import re
+from functools import lru_cache
+
+# Pages tend to repeat the same CDN prefixes and relative paths, so URL
+# parsing and resolution are memoized across extraction calls.
+_parse_url = lru_cache(maxsize=1024)(urlparse)
+_join_url = lru_cache(maxsize=1024)(urljoin)
+
+def _probe_image_size(path: str) -> Tuple[int, int]:
+    """Get the (width, height) of an image file."""
+    with Image.open(path) as img:
+        return img.size
+
+# Matches in document order, so each video's entries stay grouped together
+_VIDEO_SOURCES_XPATH = etree.XPath(
+    "//video[@src != ''] | //video[not(@src) or @src = '']//source[@src != '']"
+)
 
 class ImageInfo:
     """
     Class to store image information.
     """
+    __slots__ = ('url', 'alt', 'width', 'height', 'file_path')
+    
     def __init__(self, url: str, alt: str = "", width: Optional[int] = None, 
                  height: Optional[int] = None, file_path: Optional[str] = None):
         self.url = url
@@ -40,49 +61,63 @@ class ContentExtractor(IContentExtractor):
     Extracts and processes content from HTML.
     """
     
-    def __init__(self):
-        """Initialize the content extractor."""
-        self._session: Optional[aiohttp.ClientSession] = None
+    # Maximum number of media downloads in flight across all extraction calls
+    MAX_CONCURRENT_DOWNLOADS = 16
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        """
+        Initialize the content extractor.
+        
+        Args:
+            session: Optional session to download media with, shared with
+                other components; it is left open by close(), since its
+                owner is responsible for it
+        """
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self._download_semaphore: Optional[asyncio.Semaphore] = None
+    
+    def _get_download_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding downloads, shared by concurrent extraction calls."""
+        if self._download_semaphore is None:
+            self._download_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_DOWNLOADS)
+        return self._download_semaphore
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
         if not hasattr(self, '_session') or not self._session:
-            self._session = aiohttp.ClientSession()
+            self._session = aiohttp.ClientSession(connector=get_connector(), connector_owner=False)
         return self._session
     
     async def close(self):
-        """Close the session if it exists."""
-        if hasattr(self, '_session') and self._session:
+        """Close the session if it exists, unless it was passed in by the caller."""
+        if hasattr(self, '_session') and self._session and self._owns_session:
             await self._session.close()
             self._session = None
 
-    async def extract_text(self, html: str) -> str:
+    async def extract_text(self, html: Union[str, etree._Element]) -> str:
         """
         Extract clean text from HTML content.
         
         Args:
-            html: HTML content
+            html: HTML content, or a document already parsed with lxml
             
         Returns:
             Cleaned text content
         """
-        soup = BeautifulSoup(html, 'lxml')
+        root = parse_html(html) if isinstance(html, str) else html
         
-        # Remove script and style elements
-        for script in soup(['script', 'style']):
-            script.decompose()
-            
-        # Get text and clean it
-        text = soup.get_text(separator=' ', strip=True)
+        # Get text without script and style contents, leaving the tree intact
+        text = get_visible_text(root, separator=' ')
         return text
 
-    async def extract_images(self, html: str, base_url: str, save_dir: Optional[str] = None,
-                           download: bool = False) -> List[ImageInfo]:
+    async def extract_images(self, html: Union[str, etree._Element], base_url: str,
+                           save_dir: Optional[str] = None, download: bool = False) -> List[ImageInfo]:
         """
         Extract image information from HTML content.
         
         Args:
-            html: HTML content
+            html: HTML content, or a document already parsed with lxml
             base_url: Base URL for resolving relative URLs
             save_dir: Directory to save downloaded images
             download: Whether to download the images
@@ -90,17 +125,11 @@ class ContentExtractor(IContentExtractor):
         Returns:
             List of ImageInfo objects
         """
-        soup = BeautifulSoup(html, 'lxml')
+        root = parse_html(html) if isinstance(html, str) else html
         images = []
         
-        # Create save directory if needed
-        if download and save_dir:
-            os.makedirs(save_dir, exist_ok=True)
-        
-        # Get session for downloading
-        session = await self._get_session()
-        
-        for img in soup.find_all('img'):
+        # Collect image information first; downloads happen afterwards in parallel
+        for img in root.iter('img'):
             try:
                 # Get image URL
                 src = img.get('src', '')
@@ -108,95 +137,148 @@ class ContentExtractor(IContentExtractor):
                     continue
                 
                 # Handle relative URLs
-                if not urlparse(src).netloc:
-                    src = urljoin(base_url, src)
+                if not _parse_url(src).netloc:
+                    src = _join_url(base_url, src)
                 
                 # Create ImageInfo object
+                width = img.get('width')
+                height = img.get('height')
                 image_info = ImageInfo(
                     url=src,
                     alt=img.get('alt', ''),
-                    width=int(img.get('width', 0)) or None,
-                    height=int(img.get('height', 0)) or None
+                    width=(int(width) or None) if width else None,
+                    height=(int(height) or None) if height else None
                 )
-                
-                if download and save_dir:
-                    try:
-                        # Download image
-                        async with session.get(src) as response:
-                            if response.status == 200:
-                                content = await response.read()
-                                
-                                # Get image dimensions if not provided
-                                if not image_info.width or not image_info.height:
-                                    with Image.open(BytesIO(content)) as img:
-                                        image_info.width, image_info.height = img.size
-                                
-                                # Generate filename
-                                filename = os.path.join(
-                                    save_dir,
-                                    f"image_{len(images)}_{os.path.basename(urlparse(src).path)}"
-                                )
-                                
-                                # Save image
-                                async with aiofiles.open(filename, 'wb') as f:
-                                    await f.write(content)
-                                
-                                image_info.file_path = filename
-                                logger.info(f"Downloaded image: {filename}")
-                            else:
-                                logger.warning(f"Failed to download image {src}: {response.status}")
-                    
-                    except Exception as e:
-                        logger.error(f"Error downloading image {src}: {e}")
-                
                 images.append(image_info)
             
             except Exception as e:
                 logger.error(f"Error processing image: {e}")
                 continue
         
+        if download and save_dir and images:
+            # Create save directory if needed
+            os.makedirs(save_dir, exist_ok=True)
+            
+            # Get session for downloading
+            session = await self._get_session()
+            semaphore = self._get_download_semaphore()
+            await asyncio.gather(*(
+                self._download_image(session, semaphore, image_info, index, save_dir)
+                for index, image_info in enumerate(images)
+            ))
+        
         return images
     
-    async def extract_structured_data(self, html: str) -> Dict[str, Any]:
+    async def _download_image(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                              image_info: ImageInfo, index: int, save_dir: str) -> None:
+        """
+        Download a single image and fill in its file path and dimensions.
+        
+        Args:
+            session: Session used for downloading
+            semaphore: Semaphore bounding concurrent downloads
+            image_info: Image to download
+            index: Position of the image on the page, used in the filename
+            save_dir: Directory to save the image
+        """
+        src = image_info.url
+        
+        # Generate filename
+        filename = os.path.join(
+            save_dir,
+            f"image_{index}_{os.path.basename(_parse_url(src).path)}"
+        )
+        
+        written = False
+        try:
+            async with semaphore:
+                # Stream the image to disk instead of buffering the whole body
+                async with session.get(src) as response:
+                    if response.status != 200:
+                        logger.warning(f"Failed to download image {src}: {response.status}")
+                        return
+                    content_type = response.headers.get('Content-Type', '')
+                    written = True
+                    async with aiofiles.open(filename, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(65536):
+                            await f.write(chunk)
+            
+            # Get image dimensions if not provided; PIL only reads the header from disk.
+            # Responses explicitly served as something other than an image are not probed.
+            is_image = not content_type or content_type.startswith('image/')
+            if is_image and (not image_info.width or not image_info.height):
+                loop = asyncio.get_running_loop()
+                image_info.width, image_info.height = await loop.run_in_executor(
+                    None, _probe_image_size, filename
+                )
+            
+            image_info.file_path = filename
+            logger.info(f"Downloaded image: {filename}")
+        
+        except Exception as e:
+            logger.error(f"Error downloading image {src}: {e}")
+            # Do not leave a partial or undecodable file behind
+            if written:
+                with contextlib.suppress(OSError):
+                    os.remove(filename)
+    
+    async def extract_structured_data(self, html: Union[str, etree._Element]) -> Dict[str, Any]:
         """
         Extract structured data from HTML content.
         
         Args:
-            html: HTML content
+            html: HTML content, or a document already parsed with lxml
             
         Returns:
             Dictionary containing structured data
         """
-        soup = BeautifulSoup(html, 'lxml')
+        root = parse_html(html) if isinstance(html, str) else html
+        
+        # Sort meta tags, headings and the title into buckets in a single
+        # traversal; the first meta tag or title found wins
+        meta = {"description": None, "keywords": None}
+        headings = {"h1": [], "h2": [], "h3": []}
+        title = None
+        for element in root.iter("meta", "h1", "h2", "h3", "title"):
+            tag = element.tag
+            if tag == "meta":
+                name = element.get("name")
+                if name in meta and meta[name] is None:
+                    meta[name] = element.get("content", "")
+            elif tag == "title":
+                if title is None:
+                    title = element
+            else:
+                headings[tag].append(get_text(element))
+        
         data = {
-            "title": soup.title.string if soup.title else "",
-            "meta_description": soup.find("meta", {"name": "description"})["content"] if soup.find("meta", {"name": "description"}) else "",
-            "meta_keywords": soup.find("meta", {"name": "keywords"})["content"] if soup.find("meta", {"name": "keywords"}) else "",
-            "headings": {
-                "h1": [h.get_text(strip=True) for h in soup.find_all("h1")],
-                "h2": [h.get_text(strip=True) for h in soup.find_all("h2")],
-                "h3": [h.get_text(strip=True) for h in soup.find_all("h3")]
-            }
+            "title": title.text if title is not None else "",
+            "meta_description": meta["description"] or "",
+            "meta_keywords": meta["keywords"] or "",
+            "headings": headings
         }
         return data
     
     async def extract_videos(
         self,
-        html: str,
+        html: Union[str, etree._Element],
         base_url: str,
         save_dir: str = "videos",
         download: bool = False,
-        video_types: List[str] = None
+        video_types: List[str] = None,
+        max_size_mb: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Extract video URLs and optionally download them.
         
         Args:
-            html: HTML content to extract videos from
+            html: HTML content to extract videos from, or a document already
+                parsed with lxml, which is searched without re-parsing
             base_url: Base URL for resolving relative paths
             save_dir: Directory to save downloaded videos
             download: Whether to download the videos
             video_types: List of video file extensions to extract (default: ['.mp4', '.webm', '.ogg'])
+            max_size_mb: Skip downloading videos larger than this many MB (default: no limit)
             
         Returns:
             List of dictionaries containing video information:
@@ -211,63 +293,86 @@ class ContentExtractor(IContentExtractor):
         if video_types is None:
             video_types = ['.mp4', '.webm', '.ogg']
             
-        soup = BeautifulSoup(html, 'html.parser')
+        root = parse_html(html) if isinstance(html, str) else html
         videos = []
         
-        # Extract from video tags
-        for video in soup.find_all('video'):
-            # Check for src attribute first
-            src = video.get('src')
-            if src:
-                abs_url = urljoin(base_url, src)
-                video_info = {
-                    'url': abs_url,
-                    'type': os.path.splitext(src)[1].lower(),
-                    'source': 'video',
-                    'title': video.get('title', ''),
-                    'metadata': {
-                        'width': video.get('width', ''),
-                        'height': video.get('height', ''),
-                        'controls': video.has_attr('controls')
-                    }
-                }
-                videos.append(video_info)
-                continue
-                
-            # Check for source tags
-            for source in video.find_all('source'):
-                src = source.get('src')
-                if src:
-                    abs_url = urljoin(base_url, src)
-                    video_info = {
-                        'url': abs_url,
-                        'type': os.path.splitext(src)[1].lower(),
-                        'source': 'video',
-                        'title': video.get('title', ''),
-                        'metadata': {
-                            'width': video.get('width', ''),
-                            'height': video.get('height', ''),
-                            'controls': video.has_attr('controls'),
-                            'type': source.get('type', '')
-                        }
-                    }
-                    videos.append(video_info)
+        # Video tags with a src, or the source tags of video tags without one
+        for element in _VIDEO_SOURCES_XPATH(root):
+            src = element.get('src')
+            if element.tag == 'source':
+                video = next(element.iterancestors('video'))
+            else:
+                video = element
+            
+            metadata = {
+                'width': video.get('width', ''),
+                'height': video.get('height', ''),
+                'controls': 'controls' in video.attrib
+            }
+            if element is not video:
+                metadata['type'] = element.get('type', '')
+            
+            videos.append({
+                'url': _join_url(base_url, src),
+                'type': os.path.splitext(src)[1].lower(),
+                'source': 'video',
+                'title': video.get('title', ''),
+                'metadata': metadata
+            })
                     
         if download and videos:
             os.makedirs(save_dir, exist_ok=True)
-            for video in videos:
-                filename = os.path.join(save_dir, os.path.basename(video['url']))
-                try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(video['url']) as response:
-                            if response.status == 200:
-                                with open(filename, 'wb') as f:
-                                    f.write(await response.read())
-                                video['local_path'] = filename
-                except Exception as e:
-                    logger.error(f"Failed to download video {video['url']}: {str(e)}")
+            session = await self._get_session()
+            semaphore = self._get_download_semaphore()
+            max_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+            await asyncio.gather(*(
+                self._download_video(session, semaphore, video, save_dir, max_bytes) for video in videos
+            ))
                     
         return videos
+    
+    async def _download_video(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                              video: Dict[str, Any], save_dir: str,
+                              max_bytes: Optional[int] = None) -> None:
+        """
+        Download a single video and record its local path.
+        Oversize videos are rejected from the response headers before the body
+        is read, or as soon as the streamed body passes the limit.
+        
+        Args:
+            session: Session used for downloading
+            semaphore: Semaphore bounding concurrent downloads
+            video: Video information, updated with 'local_path' on success
+            save_dir: Directory to save the video
+            max_bytes: Maximum video size in bytes, or None for no limit
+        """
+        filename = os.path.join(save_dir, os.path.basename(video['url']))
+        try:
+            async with semaphore:
+                async with session.get(video['url']) as response:
+                    if response.status != 200:
+                        return
+                    if max_bytes is not None and (response.content_length or 0) > max_bytes:
+                        logger.info(f"Skipping video {video['url']}: {response.content_length} bytes exceeds limit")
+                        return
+                    
+                    # Stream to disk instead of buffering the whole video
+                    written = 0
+                    async with aiofiles.open(filename, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(65536):
+                            written += len(chunk)
+                            if max_bytes is not None and written > max_bytes:
+                                break
+                            await f.write(chunk)
+                    
+                    if max_bytes is not None and written > max_bytes:
+                        # The server sent no usable length; drop the partial file
+                        os.remove(filename)
+                        logger.info(f"Skipping video {video['url']}: exceeds {max_bytes} bytes")
+                        return
+                    video['local_path'] = filename
+        except Exception as e:
+            logger.error(f"Failed to download video {video['url']}: {str(e)}")
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -275,4 +380,4 @@ class ContentExtractor(IContentExtractor):
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        pass
+        await self.close()
@@ -1,19 +1,78 @@
 """
 Data classifier module for content categorization.
 """
-from typing import Dict, List, Tuple, Any
+import hashlib
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
+import ahocorasick
 from ..interfaces import IDataClassifier
 
 class DataClassifier(IDataClassifier):
     """
     Implements content classification functionality.
     Uses a keyword-based approach for text classification.
+    All keywords are matched in a single pass with an Aho-Corasick automaton
+    that is rebuilt lazily after categories or keywords change.
     """
     
+    # Maximum number of cached classification results
+    CACHE_SIZE = 4096
+    
     def __init__(self):
         """Initialize the classifier with empty categories."""
-        self.categories: Dict[str, List[str]] = {}
-        self.training_data: List[Tuple[str, str]] = []
+        self.categories: Dict[str, Set[str]] = {}
+        # Category names in insertion order, kept in sync by add/remove_category
+        self._categories_list: List[str] = []
+        # Training data is kept column-wise: contents plus compact int label ids
+        self._train_contents: List[str] = []
+        self._train_labels = array('i')
+        self._label_ids: Dict[str, int] = {}
+        self._label_names: List[str] = []
+        self._automaton: Optional[ahocorasick.Automaton] = None
+        # content digest -> category, in least recently used order
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+    
+    @property
+    def training_data(self) -> List[Tuple[str, str]]:
+        """All (content, label) pairs seen by train(), rebuilt from the stored columns."""
+        names = self._label_names
+        return [(content, names[label_id])
+                for content, label_id in zip(self._train_contents, self._train_labels)]
+    
+    def _label_id(self, label: str) -> int:
+        """Get the integer id for a training label, assigning a new one if needed."""
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = self._label_ids[label] = len(self._label_names)
+            self._label_names.append(label)
+        return label_id
+    
+    def _invalidate(self) -> None:
+        """Mark the keyword automaton and cached results as stale after a mutation."""
+        self._automaton = None
+        self._cache.clear()
+    
+    def _get_automaton(self) -> Optional[ahocorasick.Automaton]:
+        """Get the keyword automaton, building it if needed."""
+        if self._automaton is None:
+            # keyword -> indexes of the categories containing it
+            keyword_categories: Dict[str, List[int]] = {}
+            for index, keywords in enumerate(self.categories.values()):
+                for keyword in keywords:
+                    if keyword:
+                        keyword_categories.setdefault(keyword, []).append(index)
+            
+            if not keyword_categories:
+                return None
+            
+            # Payloads are plain ints so the scan never hashes keyword strings
+            automaton = ahocorasick.Automaton()
+            for keyword_id, (keyword, indexes) in enumerate(keyword_categories.items()):
+                automaton.add_word(keyword, (keyword_id, tuple(indexes)))
+            automaton.make_automaton()
+            self._automaton = automaton
+        return self._automaton
     
     def classify(self, content: str) -> str:
         """
@@ -28,25 +87,83 @@ class DataClassifier(IDataClassifier):
         if not self.categories:
             raise ValueError("No categories defined. Please add categories before classification.")
         
+        # Re-fetched pages often have identical content, so results are cached by digest
+        key = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+        category = self._cache.get(key)
+        if category is not None:
+            self._cache.move_to_end(key)
+            return category
+        
+        category = self._classify_uncached(content)
+        self._cache[key] = category
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return category
+    
+    def classify_batch(self, contents: List[str]) -> List[str]:
+        """
+        Classify many pieces of content at once.
+        The keyword automaton is fetched once for the whole batch and identical
+        contents within the batch are only scanned once.
+        
+        Args:
+            contents: Contents to classify
+            
+        Returns:
+            Category labels, in the same order as contents
+        """
+        if not self.categories:
+            raise ValueError("No categories defined. Please add categories before classification.")
+        
+        automaton = self._get_automaton()
+        results: List[str] = []
+        for content in contents:
+            key = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+            category = self._cache.get(key)
+            if category is not None:
+                self._cache.move_to_end(key)
+            else:
+                category = self._classify_uncached(content, automaton)
+                self._cache[key] = category
+            results.append(category)
+        
+        while len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return results
+    
+    def _classify_uncached(self, content: str,
+                           automaton: Optional[ahocorasick.Automaton] = None) -> str:
+        """Classify content by scanning it for keywords."""
+        # Count distinct matched keywords per category in one pass over the content
+        counts = [0] * len(self.categories)
+        if automaton is None:
+            automaton = self._get_automaton()
+        if automaton is not None:
+            matched = set()
+            for _, (keyword_id, indexes) in automaton.iter(content):
+                if keyword_id not in matched:
+                    matched.add(keyword_id)
+                    for index in indexes:
+                        counts[index] += 1
+        
         max_matches = 0
-        best_category = next(iter(self.categories))  # Default to first category
+        best_index = 0  # Default to first category
         
-        for category, keywords in self.categories.items():
-            matches = sum(1 for keyword in keywords if keyword in content)
+        for index, matches in enumerate(counts):
             if matches > max_matches:
                 max_matches = matches
-                best_category = category
+                best_index = index
         
-        return best_category
+        return self._categories_list[best_index]
     
     def get_categories(self) -> List[str]:
         """
         Get list of available categories.
         
         Returns:
-            List of category labels
+            List of category labels, shared with the classifier and not to be modified
         """
-        return list(self.categories.keys())
+        return self._categories_list
     
     def train(self, training_data: List[Tuple[str, str]]) -> None:
         """
@@ -56,15 +173,18 @@ class DataClassifier(IDataClassifier):
         Args:
             training_data: List of (content, label) pairs
         """
-        self.training_data.extend(training_data)
-        
-        # Update keyword lists based on frequency analysis
+        # Gather words per label first so each category set is merged once
+        words_by_label: Dict[str, Set[str]] = {}
         for content, label in training_data:
+            self._train_contents.append(content)
+            self._train_labels.append(self._label_id(label))
             if label in self.categories:
-                words = content.split()
-                for word in words:
-                    if len(word) > 1 and word not in self.categories[label]:
-                        self.categories[label].append(word)
+                words_by_label.setdefault(label, set()).update(content.split())
+        
+        # Update keyword sets based on frequency analysis
+        for label, words in words_by_label.items():
+            self.categories[label].update(word for word in words if len(word) > 1)
+        self._invalidate()
     
     def add_category(self, category: str, keywords: List[str] = None) -> None:
         """
@@ -75,7 +195,9 @@ class DataClassifier(IDataClassifier):
             keywords: Initial keywords for the category
         """
         if category not in self.categories:
-            self.categories[category] = keywords or []
+            self.categories[category] = set(keywords or ())
+            self._categories_list.append(category)
+            self._invalidate()
     
     def remove_category(self, category: str) -> bool:
         """
@@ -89,6 +211,8 @@ class DataClassifier(IDataClassifier):
         """
         if category in self.categories:
             del self.categories[category]
+            self._categories_list.remove(category)
+            self._invalidate()
             return True
         return False
     
@@ -107,11 +231,43 @@ class DataClassifier(IDataClassifier):
         if category not in self.categories:
             return False
             
+        self._apply_keywords(category, keywords, mode)
+        self._invalidate()
+        return True
+    
+    def bulk_update(self, updates: Iterable[Tuple[str, List[str]]], mode: str = 'add') -> int:
+        """
+        Update keywords for many categories, rebuilding the automaton only once.
+        
+        Args:
+            updates: (category, keywords) pairs to apply
+            mode: Operation mode, either 'add' or 'remove'
+            
+        Returns:
+            Number of updates applied; updates for unknown categories are skipped
+        """
+        if mode not in ('add', 'remove'):
+            raise ValueError("Mode must be either 'add' or 'remove'")
+        
+        applied = 0
+        for category, keywords in updates:
+            if category in self.categories:
+                self._apply_keywords(category, keywords, mode)
+                applied += 1
+        
+        if applied:
+            self._invalidate()
+        return applied
+    
+    def flush(self) -> None:
+        """Rebuild the keyword automaton now instead of on the next classification."""
+        self._get_automaton()
+    
+    def _apply_keywords(self, category: str, keywords: List[str], mode: str) -> None:
+        """Add or remove keywords of an existing category without invalidating."""
         if mode == 'add':
-            self.categories[category].extend([k for k in keywords if k not in self.categories[category]])
+            self.categories[category].update(keywords)
         elif mode == 'remove':
-            self.categories[category] = [k for k in self.categories[category] if k not in keywords]
+            self.categories[category].difference_update(keywords)
         else:
             raise ValueError("Mode must be either 'add' or 'remove'")
-            
-        return True
@@ -2,17 +2,87 @@
 Data storage implementation.
 """
 import os
-import json
-from typing import Dict, Any, List
+import mmap
+import asyncio
+import orjson
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Set, Tuple
 import aiofiles
 from loguru import logger
 from ..interfaces import IDataStorage
 
+# Int and other non-str keys are stringified, as the stdlib json module does
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
+def _dumps_line(item: Dict[str, Any]) -> bytes:
+    """Serialize an item as one NDJSON line."""
+    return orjson.dumps(item, option=_DUMPS_OPTIONS)
+
+# Placeholder for fields an item does not have
+_MISSING = object()
+
+def _hashable(value: Any) -> bool:
+    """Check whether a value can be used as an index key."""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+class _CategoryIndex:
+    """
+    In-memory secondary index over one NDJSON category file.
+    Maps each top-level field and hashable value to the positions of the
+    items holding it, and remembers where every item's line starts.
+    """
+    
+    __slots__ = ('offsets', 'fields')
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self.offsets: List[int] = []  # item position -> byte offset of its line
+        self.fields: Dict[str, Dict[Any, List[int]]] = {}  # field -> value -> item positions
+    
+    def add(self, item: Dict[str, Any], offset: int) -> None:
+        """Index an item whose line starts at the given byte offset."""
+        position = len(self.offsets)
+        self.offsets.append(offset)
+        for key, value in item.items():
+            if _hashable(value):
+                self.fields.setdefault(key, {}).setdefault(value, []).append(position)
+    
+    def lookup(self, query: Dict[str, Any]) -> Optional[List[int]]:
+        """
+        Find the positions of items that may match a query.
+        
+        Args:
+            query: Query parameters for filtering data
+            
+        Returns:
+            Sorted candidate positions, or None if every item is a candidate
+        """
+        candidates: Optional[Set[int]] = None
+        for key, value in query.items():
+            if key == 'category' or not _hashable(value):
+                continue
+            postings = self.fields.get(key, {}).get(value)
+            if not postings:
+                return []
+            candidates = set(postings) if candidates is None else candidates.intersection(postings)
+            if not candidates:
+                return []
+        return None if candidates is None else sorted(candidates)
+
 class DataStorage(IDataStorage):
     """
     Handles data storage and retrieval.
+    Queries are answered from a per-category secondary index that is built
+    on first access and kept up to date by save and update. Category files
+    are read through read-only memory maps that are reused across queries.
     """
     
+    # Lines parsed between yields to the event loop during full file scans
+    SCAN_BATCH = 1000
+    
     def __init__(self, storage_dir: str):
         """
         Initialize data storage.
@@ -21,6 +91,15 @@ class DataStorage(IDataStorage):
             storage_dir: Directory for storing data
         """
         self.storage_dir = storage_dir
+        # Category files known to exist, so hot paths can skip the stat call
+        self._known_paths: Set[str] = set()
+        self._indexes: Dict[str, _CategoryIndex] = {}  # category path -> index
+        # category path -> mapping of the file, or None for an empty file;
+        # dropped whenever the file changes so the next read remaps it
+        self._mmaps: Dict[str, Optional[mmap.mmap]] = {}
+        # category path -> lock serializing index builds with writes to the
+        # file, so no line is written between a build's scan and its publication
+        self._locks: Dict[str, asyncio.Lock] = {}
         self._ensure_storage_dir()
     
     def _ensure_storage_dir(self) -> None:
@@ -29,11 +108,115 @@ class DataStorage(IDataStorage):
     
     def _get_category_path(self, category: str) -> str:
         """Get path for category file."""
-        return os.path.join(self.storage_dir, f"{category}.json")
+        return os.path.join(self.storage_dir, f"{category}.ndjson")
+    
+    async def _category_exists(self, category_path: str) -> bool:
+        """Check whether a category file exists, without blocking the event loop."""
+        if category_path in self._known_paths:
+            return True
+        
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, os.path.exists, category_path):
+            self._known_paths.add(category_path)
+            return True
+        return False
+    
+    @staticmethod
+    def _compile_matcher(query: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Build a predicate checking whether an item matches all non-category query fields.
+        The query is inspected once, so the per-item check does no dict iteration.
+        
+        Args:
+            query: Query parameters for filtering data
+            
+        Returns:
+            Function returning True for matching items
+        """
+        conditions = [(key, value) for key, value in query.items() if key != 'category']
+        if not conditions:
+            return lambda item: True
+        if len(conditions) == 1:
+            (key, value), = conditions
+            return lambda item: item.get(key, _MISSING) == value
+        return lambda item: all(item.get(key, _MISSING) == value for key, value in conditions)
+    
+    @staticmethod
+    def _map_file(category_path: str) -> Optional[mmap.mmap]:
+        """Memory-map a category file read-only; empty files cannot be mapped."""
+        with open(category_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    async def _get_mmap(self, category_path: str) -> Optional[mmap.mmap]:
+        """Get the memory map of a category file, mapping it if needed."""
+        if category_path not in self._mmaps:
+            loop = asyncio.get_running_loop()
+            self._mmaps[category_path] = await loop.run_in_executor(
+                None, self._map_file, category_path
+            )
+        return self._mmaps[category_path]
+    
+    async def _scan_lines(self, mm: Optional[mmap.mmap]) -> AsyncIterator[Tuple[int, bytes]]:
+        """Yield (offset, line) for every non-blank line of a mapped file."""
+        if mm is None:
+            return
+        
+        start = 0
+        size = len(mm)
+        scanned = 0
+        while start < size:
+            end = mm.find(b'\n', start)
+            if end == -1:
+                end = size
+            line = mm[start:end]
+            if line.strip():
+                yield start, line
+            start = end + 1
+            
+            scanned += 1
+            if scanned % self.SCAN_BATCH == 0:
+                await asyncio.sleep(0)
+    
+    def _get_lock(self, category_path: str) -> asyncio.Lock:
+        """Get the lock guarding writes and index builds for a category file."""
+        lock = self._locks.get(category_path)
+        if lock is None:
+            lock = self._locks[category_path] = asyncio.Lock()
+        return lock
+    
+    async def _get_index(self, category_path: str) -> _CategoryIndex:
+        """Get the index for a category file, building it with one scan if needed."""
+        index = self._indexes.get(category_path)
+        if index is None:
+            async with self._get_lock(category_path):
+                index = await self._load_index(category_path)
+        return index
+    
+    async def _load_index(self, category_path: str) -> _CategoryIndex:
+        """Get or build the index for a category file; the caller holds its lock."""
+        index = self._indexes.get(category_path)
+        if index is None:
+            index = _CategoryIndex()
+            async for offset, line in self._scan_lines(await self._get_mmap(category_path)):
+                index.add(orjson.loads(line), offset)
+            self._indexes[category_path] = index
+        return index
+    
+    async def _read_items(self, category_path: str) -> List[Dict[str, Any]]:
+        """Read all items from an NDJSON category file."""
+        items = []
+        async with aiofiles.open(category_path, 'rb') as f:
+            async for line in f:
+                if line.strip():
+                    items.append(orjson.loads(line))
+        return items
     
     async def save(self, data: Dict[str, Any], category: str) -> bool:
         """
         Save data to storage.
+        Items are appended to the category file as one JSON document per line.
         
         Args:
             data: Data to save
@@ -45,20 +228,22 @@ class DataStorage(IDataStorage):
         try:
             category_path = self._get_category_path(category)
             
-            # Load existing data
-            existing_data = []
-            if os.path.exists(category_path):
-                async with aiofiles.open(category_path, 'r', encoding='utf-8') as f:
-                    content = await f.read()
-                    if content:
-                        existing_data = json.loads(content)
-            
-            # Append new data
-            existing_data.append(data)
-            
-            # Save updated data
-            async with aiofiles.open(category_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(existing_data, indent=2, ensure_ascii=False))
+            line = _dumps_line(data)
+            async with self._get_lock(category_path):
+                async with aiofiles.open(category_path, 'ab') as f:
+                    await f.write(line)
+                    # Appends always land at the end of the file, so once flushed
+                    # the file position is where this line ends
+                    await f.flush()
+                    end = await f.tell()
+                self._known_paths.add(category_path)
+                self._mmaps.pop(category_path, None)
+                
+                index = self._indexes.get(category_path)
+                if index is not None:
+                    # Index what was written, since orjson may change values
+                    # such as dates and non-str keys
+                    index.add(orjson.loads(line), end - len(line))
             
             logger.info(f"Saved data to category: {category}")
             return True
@@ -67,6 +252,46 @@ class DataStorage(IDataStorage):
             logger.error(f"Error saving data: {e}")
             return False
     
+    async def iter_retrieve(self, query: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream matching data from storage.
+        Items are yielded as they are read, so memory use does not grow with
+        the size of the category file and callers may stop early.
+        
+        Args:
+            query: Query parameters for filtering data
+            
+        Yields:
+            Matching data items
+        """
+        category = query.get('category')
+        if not category:
+            return
+        
+        category_path = self._get_category_path(category)
+        if not await self._category_exists(category_path):
+            return
+        
+        index = await self._get_index(category_path)
+        candidates = index.lookup(query)
+        matches = self._compile_matcher(query)
+        mm = await self._get_mmap(category_path)
+        
+        # Filter data based on query parameters
+        if candidates is None:
+            async for _, line in self._scan_lines(mm):
+                item = orjson.loads(line)
+                if matches(item):
+                    yield item
+        else:
+            # Only parse the candidate lines; unindexed fields are still checked
+            for position in candidates:
+                start = index.offsets[position]
+                end = mm.find(b'\n', start)
+                item = orjson.loads(mm[start:end if end != -1 else len(mm)])
+                if matches(item):
+                    yield item
+    
     async def retrieve(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Retrieve data from storage.
@@ -78,32 +303,7 @@ class DataStorage(IDataStorage):
             List of matching data items
         """
         try:
-            category = query.get('category')
-            if not category:
-                return []
-            
-            category_path = self._get_category_path(category)
-            if not os.path.exists(category_path):
-                return []
-            
-            async with aiofiles.open(category_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                if not content:
-                    return []
-                data = json.loads(content)
-            
-            # Filter data based on query parameters
-            filtered_data = []
-            for item in data:
-                match = True
-                for key, value in query.items():
-                    if key != 'category' and (key not in item or item[key] != value):
-                        match = False
-                        break
-                if match:
-                    filtered_data.append(item)
-            
-            return filtered_data
+            return [item async for item in self.iter_retrieve(query)]
             
         except Exception as e:
             logger.error(f"Error retrieving data: {e}")
@@ -126,36 +326,102 @@ class DataStorage(IDataStorage):
                 return False
             
             category_path = self._get_category_path(category)
-            if not os.path.exists(category_path):
+            if not await self._category_exists(category_path):
                 return False
             
-            # Load existing data
-            async with aiofiles.open(category_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                if not content:
+            # Held until the rewrite is indexed, so no save is lost in between
+            async with self._get_lock(category_path):
+                # Skip reading and rewriting the file when the index rules out every item
+                index = await self._load_index(category_path)
+                if index.lookup(query) == []:
                     return False
-                data = json.loads(content)
-            
-            # Update matching items
-            updated = False
-            for item in data:
-                match = True
-                for key, value in query.items():
-                    if key != 'category' and (key not in item or item[key] != value):
-                        match = False
-                        break
-                if match:
-                    item.update(new_data)
-                    updated = True
-            
-            if updated:
-                # Save updated data
-                async with aiofiles.open(category_path, 'w', encoding='utf-8') as f:
-                    await f.write(json.dumps(data, indent=2, ensure_ascii=False))
-                logger.info(f"Updated data in category: {category}")
-            
-            return updated
+                
+                # Load existing data
+                data = await self._read_items(category_path)
+                
+                # Update matching items
+                matches = self._compile_matcher(query)
+                updated = False
+                for item in data:
+                    if matches(item):
+                        item.update(new_data)
+                        updated = True
+                
+                if updated:
+                    # Write to a temporary file and swap it in atomically
+                    lines = [_dumps_line(item) for item in data]
+                    tmp_path = category_path + ".tmp"
+                    async with aiofiles.open(tmp_path, 'wb') as f:
+                        await f.write(b''.join(lines))
+                    # Drop the old mapping first; Windows refuses to replace a mapped file
+                    self._mmaps.pop(category_path, None)
+                    os.replace(tmp_path, category_path)
+                    
+                    # Line offsets have moved, so reindex from the lines just written
+                    index = _CategoryIndex()
+                    offset = 0
+                    for line in lines:
+                        index.add(orjson.loads(line), offset)
+                        offset += len(line)
+                    self._indexes[category_path] = index
+                    logger.info(f"Updated data in category: {category}")
+                
+                return updated
             
         except Exception as e:
             logger.error(f"Error updating data: {e}")
             return False
+    
+    async def export_pretty(self, category: str, out_path: str) -> int:
+        """
+        Export a category as one indented JSON array for reading by humans.
+        The storage files themselves stay compact NDJSON.
+        
+        Args:
+            category: Category to export
+            out_path: Path of the JSON file to write
+            
+        Returns:
+            Number of exported items
+        """
+        items = await self.retrieve({'category': category})
+        async with aiofiles.open(out_path, 'wb') as f:
+            await f.write(orjson.dumps(items, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2))
+        return len(items)
+    
+    async def migrate_json_files(self) -> int:
+        """
+        Convert category files from the old JSON array format to NDJSON.
+        Items are appended to any NDJSON file that already exists for the
+        category, and the old .json file is removed.
+        
+        Returns:
+            Number of migrated category files
+        """
+        migrated = 0
+        for filename in os.listdir(self.storage_dir):
+            if not filename.endswith('.json'):
+                continue
+            
+            legacy_path = os.path.join(self.storage_dir, filename)
+            category = filename[:-len('.json')]
+            try:
+                async with aiofiles.open(legacy_path, 'rb') as f:
+                    content = await f.read()
+                items = orjson.loads(content) if content else []
+                
+                category_path = self._get_category_path(category)
+                async with self._get_lock(category_path):
+                    async with aiofiles.open(category_path, 'ab') as f:
+                        await f.write(b''.join(_dumps_line(item) for item in items))
+                    self._known_paths.add(category_path)
+                    self._indexes.pop(category_path, None)
+                    self._mmaps.pop(category_path, None)
+                
+                os.remove(legacy_path)
+                migrated += 1
+                logger.info(f"Migrated category {category} to NDJSON")
+            except Exception as e:
+                logger.error(f"Error migrating {legacy_path}: {e}")
+        
+        return migrated
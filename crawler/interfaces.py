@@ -296,6 +296,88 @@ class ITaskManager(ABC):
         """
         pass
 
+class IQueueManager(ABC):
+    """
+    Interface for managing the task queue.
+    Handles adding tasks to and taking tasks from the queue.
+    """
+    
+    @abstractmethod
+    async def push_task(self, task: Dict[str, Any]) -> bool:
+        """
+        Add a new task to the queue.
+        
+        Args:
+            task (Dict[str, Any]): Task configuration
+            
+        Returns:
+            bool: True if task was queued successfully
+        """
+        pass
+    
+    @abstractmethod
+    async def pop_task(self) -> Dict[str, Any]:
+        """
+        Get the next task from the queue.
+        
+        Returns:
+            Dict[str, Any]: Next task configuration
+        """
+        pass
+    
+    @abstractmethod
+    def get_queue_status(self) -> Dict[str, Any]:
+        """
+        Get the current queue status.
+        
+        Returns:
+            Dict[str, Any]: Queue size and number of active tasks
+        """
+        pass
+
+class ITaskScheduler(ABC):
+    """
+    Interface for scheduling tasks.
+    Handles running tasks at a given time.
+    """
+    
+    @abstractmethod
+    def schedule_task(self, task: Dict[str, Any], schedule_time: datetime) -> str:
+        """
+        Schedule a task for future execution.
+        
+        Args:
+            task (Dict[str, Any]): Task configuration
+            schedule_time (datetime): When to execute the task
+            
+        Returns:
+            str: Task ID
+        """
+        pass
+    
+    @abstractmethod
+    def cancel_task(self, task_id: str) -> bool:
+        """
+        Cancel a scheduled task.
+        
+        Args:
+            task_id (str): ID of the task to cancel
+            
+        Returns:
+            bool: True if the task was cancelled, False if it didn't exist
+        """
+        pass
+    
+    @abstractmethod
+    def get_scheduled_tasks(self) -> List[Dict[str, Any]]:
+        """
+        Get all scheduled tasks.
+        
+        Returns:
+            List[Dict[str, Any]]: Scheduled tasks with their IDs and times
+        """
+        pass
+
 class IPerformanceMonitor(ABC):
     """
     Interface for performance monitoring.
@@ -303,7 +385,7 @@ class IPerformanceMonitor(ABC):
     """
     
     @abstractmethod
-    def record_metrics(self, metrics: Dict[str, Any]) -> None:
+    async def record_metrics(self, metrics: Dict[str, Any]) -> None:
         """
         Record performance metrics.
         
@@ -429,3 +511,49 @@ class IDataProcessor(ABC):
             bool: True if save successful, False otherwise
         """
         pass
+
+class IConfigManager(ABC):
+    """
+    Interface for configuration management.
+    Handles loading, updating, and accessing configuration values.
+    """
+    
+    @abstractmethod
+    def load_config(self, config_path: str) -> Dict[str, Any]:
+        """
+        Load configuration from file.
+        
+        Args:
+            config_path (str): Path to configuration file
+            
+        Returns:
+            Dict[str, Any]: Loaded configuration
+        """
+        pass
+    
+    @abstractmethod
+    def update_config(self, config_path: str, new_config: Dict[str, Any]) -> bool:
+        """
+        Update configuration file.
+        
+        Args:
+            config_path (str): Path to configuration file
+            new_config (Dict[str, Any]): New configuration values
+            
+        Returns:
+            bool: True if update successful, False otherwise
+        """
+        pass
+    
+    @abstractmethod
+    def get_config_value(self, key: str) -> Any:
+        """
+        Get configuration value.
+        
+        Args:
+            key (str): Configuration key to retrieve
+            
+        Returns:
+            Any: Configuration value or None if not found
+        """
+        pass
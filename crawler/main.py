@@ -5,7 +5,7 @@ and provides a high-level interface for crawling operations.
 """
 import asyncio
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 from loguru import logger
 
 from .core import (
@@ -15,6 +15,7 @@ from .core import (
     TaskManager,
     Monitor
 )
+from ._net import close_connector
 
 class CrawlerSystem:
     """
@@ -22,9 +23,19 @@ class CrawlerSystem:
     Provides high-level interface for crawling operations.
     """
     
-    def __init__(self):
-        """Initialize crawler system with all required components."""
+    def __init__(self, concurrency: int = 10, rate_limit: Optional[float] = 1.0):
+        """
+        Initialize crawler system with all required components.
+        
+        Args:
+            concurrency: Number of URLs crawled at the same time
+            rate_limit: Default requests per second sent to each host, or
+                None for no limit
+        """
+        self.concurrency = concurrency
         self.request_manager = RequestManager()
+        if rate_limit is not None:
+            self.request_manager.set_rate_limit(None, rate_limit)
         self.spider = Spider(self.request_manager)
         self.data_processor = DataProcessor()
         self.task_manager = TaskManager()
@@ -51,11 +62,14 @@ class CrawlerSystem:
             # Record start time for metrics
             start_time = datetime.now()
             
-            # Crawl the URL
-            data = await self.spider.crawl(url)
+            # Fetch the page and parse it once; the spider and the text
+            # extraction share the same tree
+            content = await self.request_manager.make_request(url)
+            tree = self.data_processor.parse_html(content)
+            data = await self.spider.parse(tree)
             
             # Process the data
-            text = self.data_processor.extract_text(data['text'])
+            text = self.data_processor.extract_text(tree)
             category = self.data_processor.classify(text)
             
             # Save the processed data
@@ -92,20 +106,24 @@ class CrawlerSystem:
         Continuously process tasks from the queue.
         This method runs indefinitely until interrupted.
         
-        The processing loop:
+        Starts `concurrency` workers sharing the queue, so that the network
+        waits of different crawls overlap. Each worker:
         1. Gets next task from queue
         2. Processes the task
         3. Handles any errors
-        4. Implements rate limiting through sleep
+        
+        Request rates are limited per host by the request manager.
         """
+        await asyncio.gather(*(self._worker() for _ in range(self.concurrency)))
+    
+    async def _worker(self):
+        """Process tasks from the queue one at a time, forever."""
         while True:
+            task = await self.task_manager.pop_task()
             try:
-                task = await self.task_manager.pop_task()
-                url = task['url']
-                await self.crawl_url(url)
+                await self.crawl_url(task['url'])
             except Exception as e:
                 self.monitor.handle_error(e, {'task': task})
-            await asyncio.sleep(1)  # Prevent CPU overuse
     
     async def start(self, urls: List[str]):
         """
@@ -124,6 +142,11 @@ class CrawlerSystem:
         
         # Start processing queue
         await self.process_queue()
+    
+    async def close(self):
+        """Close the request session and the shared connection pool it runs on."""
+        await self.request_manager.close()
+        await close_connector()
 
 async def main():
     """
@@ -148,6 +171,8 @@ async def main():
         logger.info("Crawler stopped by user")
     except Exception as e:
         logger.error(f"Crawler stopped due to error: {e}")
+    finally:
+        await crawler.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,28 +1,37 @@
 """
 Error handling implementation.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from collections import deque
 from datetime import datetime
-import json
+import asyncio
+import orjson
 import aiofiles
 from loguru import logger
 from ..interfaces import IErrorHandler
 
+# One JSON document per line; non-str keys are stringified like the stdlib json module
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
 class ErrorHandler(IErrorHandler):
     """
     Handles and logs system errors.
     Implements error tracking and logging functionality.
+    Errors are appended to the log file as NDJSON in batches by a background task.
     """
     
-    def __init__(self, error_log_file: str = "error_log.json"):
+    def __init__(self, error_log_file: str = "error_log.ndjson", max_errors: int = 10000):
         """
         Initialize error handler.
         
         Args:
             error_log_file: File path for storing error logs
+            max_errors: Maximum number of recent errors kept in memory
         """
         self.error_log_file = error_log_file
-        self.errors = []
+        self.errors = deque(maxlen=max_errors)
+        self._pending: List[Dict[str, Any]] = []
+        self._save_task: Optional[asyncio.Task] = None
     
     def handle_error(self, error: Exception, context: Dict[str, Any]) -> None:
         """
@@ -45,7 +54,8 @@ class ErrorHandler(IErrorHandler):
         
         # Store error
         self.errors.append(error_entry)
-        self._save_errors()
+        self._pending.append(error_entry)
+        self._schedule_save()
     
     def get_error_log(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
         """
@@ -63,10 +73,44 @@ class ErrorHandler(IErrorHandler):
             if start_time <= datetime.fromisoformat(error['timestamp']) <= end_time
         ]
     
+    async def flush(self) -> None:
+        """Wait until all handled errors have been written to the log file."""
+        if self._save_task is not None and not self._save_task.done():
+            await self._save_task
+        if self._pending:
+            await self._save_errors()
+    
+    def _schedule_save(self) -> None:
+        """Start the background writer if it is not already running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop, e.g. called from synchronous code
+            self._write_batch_sync()
+            return
+        
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._save_errors())
+    
+    def _take_batch(self) -> bytes:
+        """Take all pending errors and serialize them as NDJSON."""
+        batch, self._pending = self._pending, []
+        # Context values that are not JSON serializable are stored as strings
+        return b''.join(orjson.dumps(entry, default=str, option=_DUMPS_OPTIONS) for entry in batch)
+    
+    def _write_batch_sync(self) -> None:
+        """Append pending errors to file without an event loop."""
+        try:
+            with open(self.error_log_file, 'ab') as f:
+                f.write(self._take_batch())
+        except Exception as e:
+            logger.error(f"Error saving error log: {e}")
+    
     async def _save_errors(self) -> None:
-        """Save errors to file."""
+        """Append pending errors to file, batching errors raised while writing."""
         try:
-            async with aiofiles.open(self.error_log_file, 'w') as f:
-                await f.write(json.dumps(self.errors, indent=2))
+            while self._pending:
+                async with aiofiles.open(self.error_log_file, 'ab') as f:
+                    await f.write(self._take_batch())
         except Exception as e:
             logger.error(f"Error saving error log: {e}")
@@ -1,39 +1,242 @@
 """
 Performance monitoring implementation.
 """
-from typing import Dict, Any, Tuple
+import os
+import asyncio
+import contextlib
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
-import json
-import aiofiles
+from itertools import accumulate
+import orjson
 from loguru import logger
 from ..interfaces import IPerformanceMonitor
 
+def _epoch(moment: datetime) -> float:
+    """Convert a datetime to epoch seconds, mapping ones out of range (e.g. datetime.min) to infinity."""
+    try:
+        return moment.timestamp()
+    except (ValueError, OverflowError, OSError):
+        return float('-inf') if moment.year < 1970 else float('inf')
+
+def _format_record(timestamp: float, payload: bytes) -> bytes:
+    """Build one NDJSON line keyed by the record time in ISO 8601 from serialized metrics."""
+    key = datetime.fromtimestamp(timestamp).isoformat().encode()
+    return b'{"' + key + b'":' + payload + b'}\n'
+
+def _append_file(path: str, data: bytes) -> None:
+    """Append bytes to a file with one buffered write."""
+    with open(path, 'ab') as f:
+        f.write(data)
+
+class _MetricSeries:
+    """
+    Time-ordered values of one metric with precomputed range aggregates.
+    Sums come from prefix sums and min/max from per-block summaries, so a
+    query looks at a few hundred summaries instead of every value in range.
+    Series holding non-numeric values are aggregated by scanning instead.
+    """
+    __slots__ = ('times', 'values', 'max_samples', '_prefix', '_block_min', '_block_max')
+    
+    # Number of values summarised by each min/max block
+    BLOCK_SIZE = 256
+    
+    def __init__(self, max_samples: Optional[int] = None):
+        """
+        Initialize an empty series.
+        
+        Args:
+            max_samples: Number of most recent values to keep, or None to
+                keep every value; the oldest are dropped a block at a time,
+                so up to BLOCK_SIZE - 1 extra values may be held
+        """
+        self.max_samples = max_samples
+        # Timestamps are always floats, so they are packed at 8 bytes each
+        # instead of being kept as float objects
+        self.times = array('d')
+        self.values: List[Any] = []
+        # prefix[i] is the sum of the first i values; None once a
+        # non-numeric value has been recorded
+        self._prefix: Optional[List[Any]] = [0]
+        self._block_min: List[Any] = []
+        self._block_max: List[Any] = []
+    
+    def add(self, timestamp: float, value: Any) -> None:
+        """
+        Add a value, keeping the series ordered by time.
+        
+        Args:
+            timestamp: Record time as epoch seconds
+            value: Recorded value
+        """
+        times = self.times
+        if times and timestamp < times[-1]:
+            # The wall clock went backwards; insert in order and rebuild
+            index = bisect_right(times, timestamp)
+            times.insert(index, timestamp)
+            self.values.insert(index, value)
+            self._rebuild()
+            return
+        
+        times.append(timestamp)
+        self.values.append(value)
+        if self._prefix is not None:
+            if isinstance(value, (int, float)):
+                self._prefix.append(self._prefix[-1] + value)
+                if (len(self.values) - 1) % self.BLOCK_SIZE == 0:
+                    self._block_min.append(value)
+                    self._block_max.append(value)
+                else:
+                    self._block_min[-1] = min(self._block_min[-1], value)
+                    self._block_max[-1] = max(self._block_max[-1], value)
+            else:
+                self._prefix = None
+        
+        if self.max_samples is not None and len(self.values) >= self.max_samples + self.BLOCK_SIZE:
+            self._trim()
+    
+    def _trim(self) -> None:
+        """Drop the oldest whole blocks so that at most BLOCK_SIZE - 1 values beyond max_samples remain."""
+        blocks = (len(self.values) - self.max_samples) // self.BLOCK_SIZE
+        drop = blocks * self.BLOCK_SIZE
+        del self.times[:drop]
+        del self.values[:drop]
+        if self._prefix is not None:
+            # Only differences of prefix sums are used, so the remaining
+            # entries stay valid without subtracting the dropped total
+            del self._prefix[:drop]
+            del self._block_min[:blocks]
+            del self._block_max[:blocks]
+    
+    def statistics(self, start: float, end: float) -> Dict[str, Any]:
+        """
+        Get count, average, min and max of the values recorded in [start, end].
+        
+        Args:
+            start: Range start as epoch seconds
+            end: Range end as epoch seconds
+            
+        Returns:
+            Dictionary containing the statistics, empty if no value is in range
+        """
+        lo = bisect_left(self.times, start)
+        hi = bisect_right(self.times, end)
+        count = hi - lo
+        if count <= 0:
+            return {}
+        
+        if self._prefix is None:
+            window = self.values[lo:hi]
+            return {
+                'count': count,
+                'average': sum(window) / count,
+                'min': min(window),
+                'max': max(window)
+            }
+        
+        return {
+            'count': count,
+            'average': (self._prefix[hi] - self._prefix[lo]) / count,
+            'min': self._range_pick(min, self._block_min, lo, hi),
+            'max': self._range_pick(max, self._block_max, lo, hi)
+        }
+    
+    def _range_pick(self, pick: Callable, blocks: List[Any], lo: int, hi: int) -> Any:
+        """Apply min or max to values[lo:hi] using the block summaries for whole blocks."""
+        size = self.BLOCK_SIZE
+        first = -(-lo // size)  # First block starting at or after lo
+        last = hi // size  # Blocks before this one end at or before hi
+        if first >= last:
+            return pick(self.values[lo:hi])
+        
+        candidates = [pick(blocks[first:last])]
+        if lo < first * size:
+            candidates.append(pick(self.values[lo:first * size]))
+        if last * size < hi:
+            candidates.append(pick(self.values[last * size:hi]))
+        return pick(candidates)
+    
+    def _rebuild(self) -> None:
+        """Recompute all aggregates from the values."""
+        values = self.values
+        if not all(isinstance(value, (int, float)) for value in values):
+            self._prefix = None
+            return
+        
+        size = self.BLOCK_SIZE
+        self._prefix = list(accumulate(values, initial=0))
+        self._block_min = [min(values[i:i + size]) for i in range(0, len(values), size)]
+        self._block_max = [max(values[i:i + size]) for i in range(0, len(values), size)]
+
 class PerformanceMonitor(IPerformanceMonitor):
     """
     Monitors and records system performance metrics.
     Implements performance tracking and statistics calculation.
     """
     
-    def __init__(self, metrics_file: str = "metrics.json"):
+    # Default number of recent values kept in memory per metric
+    MAX_SAMPLES = 100_000
+    
+    def __init__(self, metrics_file: str = "metrics.ndjson", max_samples: Optional[int] = MAX_SAMPLES):
         """
         Initialize performance monitor.
         
         Args:
-            metrics_file: File path for storing metrics
+            metrics_file: NDJSON file metrics are appended to, one record per
+                line; records already in it are loaded
+            max_samples: Number of most recent values kept in memory per
+                metric for get_statistics, or None for no limit; the file
+                always keeps every record
         """
         self.metrics_file = metrics_file
-        self.current_metrics = {}
+        self.max_samples = max_samples
+        # Recorded values of each metric, ordered by time
+        self._series: Dict[str, _MetricSeries] = {}
+        # (timestamp, serialized metrics) records waiting for the background writer
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._load_metrics()
     
-    def record_metrics(self, metrics: Dict[str, Any]) -> None:
+    async def record_metrics(self, metrics: Dict[str, Any]) -> None:
         """
         Record performance metrics.
+        The record is available to get_statistics immediately and is written
+        to the metrics file in the background; await flush() or close() to
+        make sure it has reached the file.
         
         Args:
             metrics: Dictionary containing metrics to record
         """
-        timestamp = datetime.now().isoformat()
-        self.current_metrics[timestamp] = metrics
-        self._save_metrics()
+        try:
+            # Serialized right away so later changes to the dict are not
+            # written, and before anything is recorded so a record that cannot
+            # be saved is not counted either
+            payload = orjson.dumps(metrics)
+        except orjson.JSONEncodeError as e:
+            logger.error(f"Error saving metrics: {e}")
+            return
+        
+        # Epoch seconds straight from the clock; the ISO key for the file is
+        # formatted later by the background writer
+        now = time.time()
+        self._add_record(now, metrics)
+        self._get_write_queue().put_nowait((now, payload))
+    
+    async def flush(self) -> None:
+        """Wait until every recorded metric has been written to the file."""
+        if self._writer is not None and not self._writer.done():
+            await self._write_queue.join()
+    
+    async def close(self) -> None:
+        """Write any pending metrics and stop the background writer."""
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer
+            self._writer = None
     
     def get_statistics(self, metric_name: str, time_range: Tuple[datetime, datetime]) -> Dict[str, Any]:
         """
@@ -46,28 +249,85 @@ class PerformanceMonitor(IPerformanceMonitor):
         Returns:
             Dictionary containing metric statistics
         """
+        series = self._series.get(metric_name)
+        if series is None:
+            return {}
+        
         start_time, end_time = time_range
-        relevant_metrics = []
+        return series.statistics(_epoch(start_time), _epoch(end_time))
+    
+    def _add_record(self, timestamp: float, metrics: Dict[str, Any]) -> None:
+        """
+        Add a record's values to the per-metric series.
         
-        for timestamp, metrics in self.current_metrics.items():
-            metric_time = datetime.fromisoformat(timestamp)
-            if start_time <= metric_time <= end_time and metric_name in metrics:
-                relevant_metrics.append(metrics[metric_name])
+        Args:
+            timestamp: Record time as epoch seconds
+            metrics: Dictionary containing the recorded metrics
+        """
+        for name, value in metrics.items():
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = _MetricSeries(self.max_samples)
+            series.add(timestamp, value)
+    
+    def _load_metrics(self) -> None:
+        """Load previously recorded metrics, reading the file line by line."""
+        if not os.path.exists(self.metrics_file):
+            return
         
-        if not relevant_metrics:
-            return {}
+        skipped = 0
+        try:
+            with open(self.metrics_file, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        records = orjson.loads(line)
+                        for timestamp, metrics in records.items():
+                            self._add_record(datetime.fromisoformat(timestamp).timestamp(), metrics)
+                    except (orjson.JSONDecodeError, AttributeError, ValueError):
+                        # e.g. a line cut short by a crash mid-write
+                        skipped += 1
+        except OSError as e:
+            logger.error(f"Error loading metrics: {e}")
         
-        return {
-            'count': len(relevant_metrics),
-            'average': sum(relevant_metrics) / len(relevant_metrics),
-            'min': min(relevant_metrics),
-            'max': max(relevant_metrics)
-        }
+        if skipped:
+            logger.warning(f"Skipped {skipped} malformed lines in {self.metrics_file}")
+    
+    def _get_write_queue(self) -> asyncio.Queue:
+        """Get the queue of records to write, starting the background writer if needed."""
+        if self._writer is None or self._writer.done():
+            self._write_queue = asyncio.Queue()
+            self._writer = asyncio.create_task(self._write_loop(self._write_queue))
+        return self._write_queue
     
-    async def _save_metrics(self) -> None:
-        """Save metrics to file."""
+    async def _write_loop(self, queue: asyncio.Queue) -> None:
+        """Append queued records to the file, batching everything queued so far into one write."""
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._append_lines(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _append_lines(self, records: List[Tuple[float, bytes]]) -> None:
+        """Append (timestamp, serialized metrics) records to the file."""
         try:
-            async with aiofiles.open(self.metrics_file, 'w') as f:
-                await f.write(json.dumps(self.current_metrics, indent=2))
+            data = b''.join(_format_record(timestamp, payload) for timestamp, payload in records)
+            # One worker thread hop for the whole open/write/close, rather
+            # than one per aiofiles call
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, _append_file, self.metrics_file, data)
         except Exception as e:
             logger.error(f"Error saving metrics: {e}")
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
@@ -2,7 +2,7 @@
 Queue manager for handling crawling tasks.
 """
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List
 from ..interfaces import IQueueManager
 
 class QueueManager(IQueueManager):
@@ -10,27 +10,84 @@ class QueueManager(IQueueManager):
     
     def __init__(self):
         self.queue = asyncio.Queue()
-        self.active_tasks = {}
+        # Tasks handed out by pop_task/pop_batch and not yet marked done
+        self._active = 0
     
     async def push_task(self, task: Dict[str, Any]) -> bool:
         """Add task to queue."""
         try:
             await self.queue.put(task)
-            self.active_tasks[id(task)] = task
+            return True
+        except Exception:
+            return False
+    
+    async def push_tasks(self, tasks: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Add several tasks to the queue at once.
+        The queue is unbounded, so no task has to wait for room.
+        
+        Args:
+            tasks: Tasks to add, in order
+            
+        Returns:
+            True if all tasks were added
+        """
+        try:
+            for task in tasks:
+                self.queue.put_nowait(task)
             return True
         except Exception:
             return False
     
     async def pop_task(self) -> Dict[str, Any]:
-        """Get next task from queue."""
+        """Get next task from queue; call task_done() once it has been processed."""
         task = await self.queue.get()
-        if id(task) in self.active_tasks:
-            del self.active_tasks[id(task)]
+        self._active += 1
         return task
     
+    async def pop_batch(self, max_tasks: int) -> List[Dict[str, Any]]:
+        """
+        Get up to max_tasks tasks, waiting only until the first one is available.
+        Call task_done() with the batch size once they have been processed.
+        
+        Args:
+            max_tasks: Maximum number of tasks to return
+            
+        Returns:
+            Tasks in queue order, at least one
+        """
+        batch = [await self.queue.get()]
+        while len(batch) < max_tasks and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        self._active += len(batch)
+        return batch
+    
+    def task_done(self, count: int = 1) -> None:
+        """
+        Mark tasks handed out by pop_task or pop_batch as finished.
+        
+        Args:
+            count: Number of finished tasks
+        """
+        self._active = max(0, self._active - count)
+    
+    @property
+    def queue_size(self) -> int:
+        """Number of tasks waiting in the queue."""
+        return self.queue.qsize()
+    
+    @property
+    def active_tasks_count(self) -> int:
+        """Number of tasks popped from the queue and not yet marked done."""
+        return self._active
+    
     def get_queue_status(self) -> Dict:
-        """Get current queue status."""
+        """
+        Get current queue status as a dictionary.
+        Frequent pollers should read queue_size and active_tasks_count
+        instead of building a new dictionary on every call.
+        """
         return {
-            'queue_size': self.queue.qsize(),
-            'active_tasks': len(self.active_tasks)
+            'queue_size': self.queue_size,
+            'active_tasks': self.active_tasks_count
         }
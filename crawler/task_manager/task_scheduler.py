@@ -2,8 +2,10 @@
 Task scheduler for managing scheduled tasks.
 """
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import asyncio
+import heapq
+import itertools
 from ..interfaces import ITaskScheduler
 
 class TaskScheduler(ITaskScheduler):
@@ -12,11 +14,21 @@ class TaskScheduler(ITaskScheduler):
     def __init__(self):
         self.scheduled_tasks = {}  # task_id -> (task, schedule_time)
         self.running = False
+        # Min-heap of (schedule_time, sequence, task_id, entry); cancelled
+        # entries are skipped lazily when they reach the top
+        self._heap: List[Tuple[datetime, int, str, Tuple[Dict[str, Any], datetime]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
     
     def schedule_task(self, task: Dict[str, Any], schedule_time: datetime) -> str:
         """Schedule a task for future execution."""
-        task_id = str(len(self.scheduled_tasks))
-        self.scheduled_tasks[task_id] = (task, schedule_time)
+        # The sequence number is unique for the scheduler's lifetime, so it doubles as the ID
+        sequence = next(self._sequence)
+        task_id = str(sequence)
+        entry = (task, schedule_time)
+        self.scheduled_tasks[task_id] = entry
+        heapq.heappush(self._heap, (schedule_time, sequence, task_id, entry))
+        self._wake()
         return task_id
     
     def cancel_task(self, task_id: str) -> bool:
@@ -40,19 +52,38 @@ class TaskScheduler(ITaskScheduler):
     async def start(self):
         """Start the scheduler."""
         self.running = True
+        self._wakeup = asyncio.Event()
         while self.running:
+            self._wakeup.clear()
             now = datetime.now()
-            for task_id, (task, schedule_time) in list(self.scheduled_tasks.items()):
-                if schedule_time <= now:
-                    # Task is due, remove it from scheduled tasks
-                    del self.scheduled_tasks[task_id]
-                    # Execute the task
-                    await self._execute_task(task)
-            await asyncio.sleep(1)
+            while self._heap and self._heap[0][0] <= now:
+                _, _, task_id, entry = heapq.heappop(self._heap)
+                if self.scheduled_tasks.get(task_id) is not entry:
+                    # Task was cancelled
+                    continue
+                # Task is due, remove it from scheduled tasks
+                del self.scheduled_tasks[task_id]
+                # Execute the task
+                await self._execute_task(entry[0])
+            
+            # Sleep until the next task is due, or until woken by a change
+            timeout = None
+            if self._heap:
+                timeout = max(0.0, (self._heap[0][0] - datetime.now()).total_seconds())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
     
     async def stop(self):
         """Stop the scheduler."""
         self.running = False
+        self._wake()
+    
+    def _wake(self) -> None:
+        """Wake the scheduler loop so it re-checks the next due time."""
+        if self._wakeup is not None:
+            self._wakeup.set()
     
     async def _execute_task(self, task: Dict[str, Any]):
         """Execute a scheduled task."""
@@ -5,25 +5,43 @@ import os
 import asyncio
 import aiohttp
 import platform
-import nest_asyncio
 from datetime import datetime
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
+from lxml.cssselect import CSSSelector
 
+from quant_crawler._net import close_connector
+from quant_crawler._fastparse import iter_elements, parse as parse_html
 from quant_crawler.crawler_core.spider import Spider
 from quant_crawler.crawler_core.request_manager import RequestManager
 from quant_crawler.data_processor.content_extractor import ContentExtractor
 from quant_crawler.crawler_core.rate_limiter import RateLimiter
 from loguru import logger
 
-# Apply nest_asyncio to allow nested event loops
-nest_asyncio.apply()
+# Whether the log file sink has been added in this process
+_logging_configured = False
+
+def _ensure_logging() -> None:
+    """Add the log file sink once, however many crawlers are created."""
+    global _logging_configured
+    if _logging_configured:
+        return
+    
+    log_dir = "logs"
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, f"dribbble_crawler_{datetime.now():%Y%m%d_%H%M%S}.log")
+    # Records are written by loguru's background thread so disk I/O never
+    # blocks the event loop
+    logger.add(log_file, rotation="100 MB", retention="30 days",
+               enqueue=True, backtrace=False, diagnose=False)
+    _logging_configured = True
 
 class DribbbleCrawler:
     """Dribbble crawler implementation."""
     
     def __init__(
         self,
+        session: aiohttp.ClientSession,
         save_dir: str = "images",
         max_size_mb: int = 50,
         supported_types: List[str] = None
@@ -32,6 +50,7 @@ class DribbbleCrawler:
         Initialize Dribbble crawler.
         
         Args:
+            session: aiohttp client session shared by all crawls
             save_dir: Directory to save downloaded images
             max_size_mb: Maximum image size in MB to download
             supported_types: List of supported image file extensions
@@ -40,20 +59,21 @@ class DribbbleCrawler:
         self.max_size_mb = max_size_mb
         self.supported_types = supported_types or ['.jpg', '.jpeg', '.png', '.gif', '.webp']
         
+        # Components are created once and reuse the shared session across crawls
+        self._session = session
+        self._request_manager = RequestManager(session=session)
+        self._spider = Spider(self._request_manager)
+        self._content_extractor = ContentExtractor(session=session)
+        self._rate_limiter = RateLimiter()
+        
         # Set up logging
-        log_dir = "logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        log_file = os.path.join(log_dir, f"dribbble_crawler_{datetime.now():%Y%m%d_%H%M%S}.log")
-        logger.add(log_file, rotation="100 MB", retention="30 days")
+        _ensure_logging()
         
         # Create save directory
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)
+        os.makedirs(save_dir, exist_ok=True)
     
     async def crawl_images(
         self,
-        session: aiohttp.ClientSession,
         url: str,
         download: bool = True,
         headers: Dict[str, str] = None,
@@ -67,7 +87,6 @@ class DribbbleCrawler:
         Crawl images from webpages with pagination support.
         
         Args:
-            session: aiohttp client session
             url: Target webpage URL or base URL for pagination
             download: Whether to download the images
             headers: Custom HTTP headers
@@ -81,46 +100,34 @@ class DribbbleCrawler:
             List of image information dictionaries
         """
         try:
-            # Initialize components with session
-            request_manager = RequestManager()
-            request_manager._session = session
-            spider = Spider(request_manager)
-            content_extractor = ContentExtractor()
-            content_extractor._session = session
-            rate_limiter = RateLimiter()
-            
             # Set custom headers if provided
             if headers:
-                request_manager.headers = headers
+                self._request_manager.headers = headers
             
-            # Set rate limit
-            domain = url.split('/')[2]  # Extract domain from URL
-            rate_limiter.update_rate(domain, request_delay)
+            # Set rate limit; request_delay is seconds per request, the limiter wants requests per second
+            domain = urlsplit(url).netloc  # Extract domain from URL
+            if request_delay > 0:
+                self._rate_limiter.update_rate(domain, 1 / request_delay)
+            
+            # Compile the selector once for every page of this crawl
+            find_images = CSSSelector(image_selector) if image_selector else None
             
             def parse_image_urls(html: str) -> List[str]:
                 """Parse image URLs from HTML content."""
-                soup = BeautifulSoup(html, 'html.parser')
-                image_elements = []
-                
                 # Find image elements using selector if provided
-                if image_selector:
-                    image_elements = soup.select(image_selector)
+                if find_images is not None:
+                    image_elements = find_images(parse_html(html))
                 else:
-                    # Default image element search
-                    image_elements = soup.find_all('img')
-                
-                # Extract URLs
-                urls = []
-                for element in image_elements:
-                    src = element.get('src') or element.get('data-src')
-                    if src:
-                        urls.append(src)
+                    # Default image element search, streamed without building the tree
+                    image_elements = iter_elements(html, ('img',))
                 
-                return urls
+                # Extract URLs, keeping the first occurrence of each
+                srcs = (element.get('src') or element.get('data-src') for element in image_elements)
+                return list(dict.fromkeys(src for src in srcs if src))
             
             # Crawl pages with pagination
             all_images = []
-            page_contents = await spider.crawl_with_pagination(
+            page_contents = await self._spider.crawl_with_pagination(
                 base_url=url,
                 page_parser=parse_image_urls,
                 start_page=start_page,
@@ -128,24 +135,26 @@ class DribbbleCrawler:
                 page_param=page_param
             )
             
-            # Extract and download images from each page
-            for content in page_contents:
-                if not content:
-                    continue
-                
-                images = await content_extractor.extract_images(
+            # Extract and download images from all pages concurrently; the extractor
+            # bounds the total number of downloads in flight
+            page_contents = [content for content in page_contents if content]
+            page_images = await asyncio.gather(*(
+                self._content_extractor.extract_images(
                     html=content['html'],
                     base_url=content['url'],
                     save_dir=self.save_dir if download else None,
                     download=download
                 )
-                
+                for content in page_contents
+            ))
+            
+            for content, images in zip(page_contents, page_images):
                 # Log results
-                logger.info(f"Found {len(images)} images on {content['url']}")
+                logger.info("Found {} images on {}", len(images), content['url'])
                 for image in images:
-                    logger.info(f"Image: {image['title'] or image['url']}")
+                    logger.opt(lazy=True).info("Image: {}", lambda: image['title'] or image['url'])
                     if image['local_path']:
-                        logger.info(f"Downloaded to: {image['local_path']}")
+                        logger.info("Downloaded to: {}", image['local_path'])
                 
                 all_images.extend(images)
             
@@ -154,16 +163,17 @@ class DribbbleCrawler:
         except Exception as e:
             logger.error(f"Error crawling images: {e}")
             return []
+    
+    async def aclose(self) -> None:
+        """
+        Close the crawler's components.
+        The session passed in is left open, since its owner closes it.
+        """
+        await self._request_manager.close()
+        await self._content_extractor.close()
 
 async def run():
     """Run the Dribbble crawler."""
-    # Initialize crawler
-    crawler = DribbbleCrawler(
-        save_dir="downloaded_images",
-        max_size_mb=50,
-        supported_types=['.jpg', '.jpeg', '.png', '.gif', '.webp']
-    )
-    
     # Example headers (customize as needed)
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -176,28 +186,48 @@ async def run():
     
     try:
         # Create a single session for all requests
-        async with aiohttp.ClientSession() as session:
-            # Crawl with pagination
-            if urls:
-                images = await crawler.crawl_images(
-                    session=session,
-                    url=urls[0],
-                    download=True,
-                    headers=headers,
-                    request_delay=1.0,
-                    start_page=1,
-                    max_pages=3,  # 爬取3页
-                    page_param="page",  # URL中的页码参数名
-                    image_selector="img.shot-thumbnail-img"  # Dribbble 缩略图选择器
-                )
-                
-                print(f"\nFound {len(images)} images in total")
-                for image in images:
-                    print(f"\nImage: {image['title'] or image['url']}")
-                    print(f"Type: {image['type']}")
-                    print(f"Size: {image['size']} bytes")
-                    if image['local_path']:
-                        print(f"Saved to: {image['local_path']}")
+        connector = aiohttp.TCPConnector(
+            limit=0,  # No global cap; pages of one site are bounded per host
+            limit_per_host=32,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            keepalive_timeout=75,  # Keep sockets open between paginated requests
+            enable_cleanup_closed=True
+        )
+        timeout = aiohttp.ClientTimeout(total=60, sock_connect=10, sock_read=30)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            # Initialize crawler
+            crawler = DribbbleCrawler(
+                session=session,
+                save_dir="downloaded_images",
+                max_size_mb=50,
+                supported_types=['.jpg', '.jpeg', '.png', '.gif', '.webp']
+            )
+            
+            try:
+                # Crawl with pagination
+                if urls:
+                    images = await crawler.crawl_images(
+                        url=urls[0],
+                        download=True,
+                        headers=headers,
+                        request_delay=1.0,
+                        start_page=1,
+                        max_pages=3,  # 爬取3页
+                        page_param="page",  # URL中的页码参数名
+                        image_selector="img.shot-thumbnail-img"  # Dribbble 缩略图选择器
+                    )
+                    
+                    print(f"\nFound {len(images)} images in total")
+                    for image in images:
+                        print(f"\nImage: {image['title'] or image['url']}")
+                        print(f"Type: {image['type']}")
+                        print(f"Size: {image['size']} bytes")
+                        if image['local_path']:
+                            print(f"Saved to: {image['local_path']}")
+            finally:
+                await crawler.aclose()
+                await close_connector()
     
     except Exception as e:
         print(f"Error running crawler: {e}")
@@ -208,6 +238,13 @@ def main():
         if platform.system() == 'Windows':
             # 在 Windows 上使用 ProactorEventLoop
             asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        else:
+            # Use the faster libuv-based loop when uvloop is installed
+            try:
+                import uvloop
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            except ImportError:
+                pass
         
         asyncio.run(run())
     except KeyboardInterrupt:
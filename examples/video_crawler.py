@@ -5,27 +5,136 @@ import os
 import asyncio
 import aiohttp
 import platform
-import nest_asyncio
 import ssl
 import re
 from datetime import datetime
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from typing import Iterator, List, Dict, Any, Optional
+from urllib.parse import urlsplit
+from lxml import etree
+from lxml.cssselect import CSSSelector
 
+from quant_crawler._net import close_connector
+from quant_crawler._fastparse import parse as parse_html
 from quant_crawler.crawler_core.spider import Spider
 from quant_crawler.crawler_core.request_manager import RequestManager
 from quant_crawler.data_processor.content_extractor import ContentExtractor
 from quant_crawler.crawler_core.rate_limiter import RateLimiter
 from loguru import logger
 
-# Apply nest_asyncio to allow nested event loops
-nest_asyncio.apply()
+# File extensions recognised as video links
+VIDEO_EXTENSIONS = ('.mp4', '.webm', '.avi')
+
+# Finds any of the extensions, in any case, in one C-level search
+_VIDEO_EXTENSION_PATTERN = re.compile('|'.join(map(re.escape, VIDEO_EXTENSIONS)), re.IGNORECASE)
+
+# Tags looked at by the default video element search
+_VIDEO_SEARCH_TAGS = ('video', 'source', 'iframe', 'a', 'div', 'script')
+
+# 常见的视频 URL 模式 inside script tags
+_VIDEO_URL_PATTERN = re.compile(r'https?://[^\s<>"]+?(?:\.mp4|\.webm|\.avi)[^\s<>"]*', re.IGNORECASE)
+
+# 常见的弹窗元素, combined into one selector so the page is searched once
+_POPUP_SELECTOR = CSSSelector(', '.join([
+    '.popup', '.modal', '.dialog', '.overlay',
+    '[class*="popup"]', '[class*="modal"]', '[class*="dialog"]',
+    '[id*="popup"]', '[id*="modal"]', '[id*="dialog"]',
+    'div[style*="position: fixed"]',
+    'div[style*="position:fixed"]',
+    'div[style*="z-index: 9999"]',
+    'div[style*="z-index:9999"]'
+]))
+
+def _element_video_urls(element: etree._Element) -> List[str]:
+    """
+    Get the video URLs referenced by a matched element.
+    
+    Args:
+        element: Element found by a video element search
+        
+    Returns:
+        Video URLs found on the element
+    """
+    tag = element.tag
+    if tag in ('video', 'source', 'iframe'):
+        src = element.get('src')
+        return [src] if src else []
+    if tag == 'a':
+        href = element.get('href')
+        return [href] if href else []
+    if tag == 'div':
+        # Try to find video URLs in data attributes
+        return [
+            value for attr, value in element.attrib.items()
+            if 'data' in attr and _VIDEO_EXTENSION_PATTERN.search(value)
+        ]
+    return []
+
+def _is_video_element(element: etree._Element) -> bool:
+    """
+    Check whether an element matches the default video element search.
+    
+    Args:
+        element: Element with one of the searched tags
+        
+    Returns:
+        True if the element may reference a video
+    """
+    tag = element.tag
+    if tag == 'video':
+        return True
+    if tag == 'source':
+        return 'video' in element.get('type', '')
+    if tag == 'iframe':
+        src = element.get('src', '')
+        return 'youtube.com' in src or 'vimeo.com' in src
+    if tag == 'a':
+        return _VIDEO_EXTENSION_PATTERN.search(element.get('href', '')) is not None
+    if tag == 'div':
+        return 'video' in element.get('class', '').lower()
+    return False
+
+def _default_video_urls(root: etree._Element) -> Iterator[str]:
+    """
+    Find video URLs with the default search in one pass over the document.
+    
+    Args:
+        root: Parsed page document
+        
+    Returns:
+        Iterator over video URLs in document order
+    """
+    for element in root.iter(*_VIDEO_SEARCH_TAGS):
+        if element.tag == 'script':
+            # 查找 script 标签中的视频 URL
+            if element.text:
+                yield from _VIDEO_URL_PATTERN.findall(element.text)
+        elif _is_video_element(element):
+            yield from _element_video_urls(element)
+
+# Whether the log file sink has been added in this process
+_logging_configured = False
+
+def _ensure_logging() -> None:
+    """Add the log file sink once, however many crawlers are created."""
+    global _logging_configured
+    if _logging_configured:
+        return
+    
+    log_dir = "logs"
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, f"video_crawler_{datetime.now():%Y%m%d_%H%M%S}.log")
+    # Records are written by loguru's background thread so disk I/O never
+    # blocks the event loop
+    logger.add(log_file, rotation="100 MB", retention="30 days",
+               enqueue=True, backtrace=False, diagnose=False)
+    _logging_configured = True
 
 class VideoCrawler:
     """Video crawler implementation."""
     
     def __init__(
         self,
+        session: aiohttp.ClientSession,
         save_dir: str = "videos",
         max_size_mb: int = 500,
         supported_types: List[str] = None
@@ -34,6 +143,7 @@ class VideoCrawler:
         Initialize video crawler.
         
         Args:
+            session: aiohttp client session shared by all crawls
             save_dir: Directory to save downloaded videos
             max_size_mb: Maximum video size in MB to download
             supported_types: List of supported video file extensions
@@ -42,68 +152,58 @@ class VideoCrawler:
         self.max_size_mb = max_size_mb
         self.supported_types = supported_types or ['.mp4', '.webm', '.avi']
         
+        # Components are created once and reuse the shared session across crawls
+        self._session = session
+        self._request_manager = RequestManager(session=session)
+        self._spider = Spider(self._request_manager)
+        self._content_extractor = ContentExtractor(session=session)
+        self._rate_limiter = RateLimiter()
+        
         # Set up logging
-        log_dir = "logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        log_file = os.path.join(log_dir, f"video_crawler_{datetime.now():%Y%m%d_%H%M%S}.log")
-        logger.add(log_file, rotation="100 MB", retention="30 days")
+        _ensure_logging()
         
         # Create save directory
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)
+        os.makedirs(save_dir, exist_ok=True)
     
     async def get_page_content(
         self,
-        session: aiohttp.ClientSession,
         url: str,
         headers: Dict[str, str] = None
-    ) -> str:
+    ) -> Optional[etree._Element]:
         """
         Get page content and handle potential popups in the HTML.
+        The parsed document is returned as is, so callers can search it
+        without serializing and re-parsing the whole page.
         
         Args:
-            session: aiohttp client session
             url: URL to get content from
             headers: Custom HTTP headers
             
         Returns:
-            Page HTML content with popups removed
+            Parsed page document with popups removed, or None on failure
         """
         try:
-            async with session.get(url, headers=headers) as response:
+            async with self._session.get(url, headers=headers) as response:
                 if response.status == 200:
                     html = await response.text()
                     
                     # Parse HTML
-                    soup = BeautifulSoup(html, 'html.parser')
+                    root = parse_html(html)
                     
-                    # 移除常见的弹窗元素
-                    popup_selectors = [
-                        '.popup', '.modal', '.dialog', '.overlay',
-                        '[class*="popup"]', '[class*="modal"]', '[class*="dialog"]',
-                        '[id*="popup"]', '[id*="modal"]', '[id*="dialog"]',
-                        'div[style*="position: fixed"]',
-                        'div[style*="position:fixed"]',
-                        'div[style*="z-index: 9999"]',
-                        'div[style*="z-index:9999"]'
-                    ]
+                    # 移除常见的弹窗元素, keeping the text that follows each one
+                    for element in _POPUP_SELECTOR(root):
+                        element.drop_tree()
                     
-                    for selector in popup_selectors:
-                        for element in soup.select(selector):
-                            element.decompose()
-                    
-                    return str(soup)
+                    return root
                 else:
                     logger.error(f"Error getting page content: HTTP {response.status}")
-                    return ""
+                    return None
         except Exception as e:
             logger.error(f"Error getting page content: {e}")
-            return ""
+            return None
     
     async def crawl_videos(
         self,
-        session: aiohttp.ClientSession,
         url: str,
         download: bool = True,
         headers: Dict[str, str] = None,
@@ -111,13 +211,13 @@ class VideoCrawler:
         start_page: int = 1,
         max_pages: int = 1,
         page_param: str = "page",
-        video_selector: str = None
+        video_selector: str = None,
+        max_concurrent: int = 5
     ) -> List[Dict[str, Any]]:
         """
         Crawl videos from webpages with pagination support.
         
         Args:
-            session: aiohttp client session
             url: Target webpage URL or base URL for pagination
             download: Whether to download the videos
             headers: Custom HTTP headers
@@ -126,142 +226,105 @@ class VideoCrawler:
             max_pages: Maximum number of pages to crawl
             page_param: URL parameter for page number
             video_selector: CSS selector for finding video elements
+            max_concurrent: Maximum number of pages fetched at the same time
             
         Returns:
             List of video information dictionaries
         """
         try:
-            # Initialize components with session
-            request_manager = RequestManager()
-            request_manager._session = session
-            spider = Spider(request_manager)
-            content_extractor = ContentExtractor()
-            content_extractor._session = session
-            rate_limiter = RateLimiter()
-            
             # Set custom headers if provided
             if headers:
-                request_manager.headers = headers
+                self._request_manager.headers = headers
             
-            # Set rate limit
-            domain = url.split('/')[2]  # Extract domain from URL
-            rate_limiter.update_rate(domain, request_delay)
+            # Set rate limit; request_delay is seconds per request, the limiter wants requests per second
+            domain = urlsplit(url).netloc  # Extract domain from URL
+            if request_delay > 0:
+                self._rate_limiter.update_rate(domain, 1 / request_delay)
             
-            def parse_video_urls(html: str) -> List[str]:
-                """Parse video URLs from HTML content."""
-                soup = BeautifulSoup(html, 'html.parser')
-                video_elements = []
-                
+            # Compile the selector once for every page of this crawl
+            find_videos = CSSSelector(video_selector) if video_selector else None
+            
+            def parse_video_urls(root: etree._Element) -> List[str]:
+                """Parse video URLs from a parsed page document."""
                 # Find video elements using selector if provided
-                if video_selector:
-                    video_elements = soup.select(video_selector)
+                if find_videos is not None:
+                    found = (
+                        video_url
+                        for element in find_videos(root)
+                        for video_url in _element_video_urls(element)
+                    )
                 else:
                     # Default video element search
-                    video_elements.extend(soup.find_all('video'))
-                    video_elements.extend(soup.find_all('source', type=lambda x: x and 'video' in x))
-                    video_elements.extend(soup.find_all('iframe', src=lambda x: x and ('youtube.com' in x or 'vimeo.com' in x)))
-                    # Add more video element patterns
-                    video_elements.extend(soup.find_all('a', href=lambda x: x and any(ext in x.lower() for ext in ['.mp4', '.webm', '.avi'])))
-                    video_elements.extend(soup.find_all('div', class_=lambda x: x and 'video' in x.lower()))
-                    
-                    # 查找 script 标签中的视频 URL
-                    scripts = soup.find_all('script')
-                    for script in scripts:
-                        if script.string:
-                            # 查找常见的视频 URL 模式
-                            video_urls = re.findall(r'https?://[^\s<>"]+?(?:\.mp4|\.webm|\.avi)[^\s<>"]*', script.string)
-                            for url in video_urls:
-                                video_elements.append({'src': url})
+                    found = _default_video_urls(root)
                 
-                # Extract URLs
-                urls = []
-                for element in video_elements:
-                    if element.name == 'video':
-                        src = element.get('src')
-                        if src:
-                            urls.append(src)
-                    elif element.name == 'source':
-                        src = element.get('src')
-                        if src:
-                            urls.append(src)
-                    elif element.name == 'iframe':
-                        src = element.get('src')
-                        if src:
-                            urls.append(src)
-                    elif element.name == 'a':
-                        href = element.get('href')
-                        if href:
-                            urls.append(href)
-                    elif element.name == 'div':
-                        # Try to find video URLs in data attributes
-                        for attr in element.attrs:
-                            if 'data' in attr and isinstance(element[attr], str):
-                                if any(ext in element[attr].lower() for ext in ['.mp4', '.webm', '.avi']):
-                                    urls.append(element[attr])
-                    elif isinstance(element, dict) and 'src' in element:
-                        urls.append(element['src'])
-                
-                return urls
+                # Keep the first occurrence of each URL
+                return list(dict.fromkeys(found))
             
-            # Crawl pages with pagination
-            all_videos = []
-            current_page = start_page
+            # Crawl pages with pagination, building the page URLs up front
+            separator = '&' if '?' in url else '?'
+            page_urls = [
+                f"{url}{separator}{page_param}={page}"
+                for page in range(start_page, start_page + max_pages)
+            ]
+            semaphore = asyncio.Semaphore(max_concurrent)
             
-            while current_page < start_page + max_pages:
-                # Construct page URL
-                if "?" in url:
-                    page_url = f"{url}&{page_param}={current_page}"
-                else:
-                    page_url = f"{url}?{page_param}={current_page}"
-                
-                # Get page content
-                html_content = await self.get_page_content(session, page_url, headers)
-                if not html_content:
-                    break
-                
-                # Parse videos from the page
-                video_urls = parse_video_urls(html_content)
-                if not video_urls:
+            async def fetch_page(page_url: str) -> Optional[etree._Element]:
+                """Get page content once the domain's rate limit allows it."""
+                async with semaphore:
+                    # 遵守请求延迟
+                    await self._rate_limiter.acquire(domain)
+                    return await self.get_page_content(page_url, headers)
+            
+            # Get all page contents concurrently
+            page_roots = await asyncio.gather(*(fetch_page(page_url) for page_url in page_urls))
+            
+            # Keep pages up to the first one without videos, as a page-by-page crawl would
+            pages = []
+            for page_url, page_root in zip(page_urls, page_roots):
+                if page_root is None or not parse_video_urls(page_root):
                     break
-                
-                # Extract and download videos
-                videos = await content_extractor.extract_videos(
-                    html=html_content,
+                pages.append((page_url, page_root))
+            
+            # Extract and download videos from all kept pages, reusing the parsed documents
+            page_videos = await asyncio.gather(*(
+                self._content_extractor.extract_videos(
+                    html=page_root,
                     base_url=page_url,
                     save_dir=self.save_dir if download else None,
                     download=download,
                     video_types=self.supported_types,
                     max_size_mb=self.max_size_mb
                 )
-                
+                for page_url, page_root in pages
+            ))
+            
+            all_videos = []
+            for (page_url, _), videos in zip(pages, page_videos):
                 # Log results
-                logger.info(f"Found {len(videos)} videos on {page_url}")
+                logger.info("Found {} videos on {}", len(videos), page_url)
                 for video in videos:
-                    logger.info(f"Video: {video['title'] or video['url']}")
+                    logger.opt(lazy=True).info("Video: {}", lambda: video['title'] or video['url'])
                     if video['local_path']:
-                        logger.info(f"Downloaded to: {video['local_path']}")
+                        logger.info("Downloaded to: {}", video['local_path'])
                 
                 all_videos.extend(videos)
-                current_page += 1
-                
-                # 遵守请求延迟
-                await asyncio.sleep(request_delay)
             
             return all_videos
             
         except Exception as e:
             logger.error(f"Error crawling videos: {e}")
             return []
+    
+    async def aclose(self) -> None:
+        """
+        Close the crawler's components.
+        The session passed in is left open, since its owner closes it.
+        """
+        await self._request_manager.close()
+        await self._content_extractor.close()
 
 async def run():
     """Run the video crawler."""
-    # Initialize crawler
-    crawler = VideoCrawler(
-        save_dir="downloaded_videos",
-        max_size_mb=500,
-        supported_types=['.mp4', '.webm', '.avi']
-    )
-    
     # Example headers (customize as needed)
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -285,29 +348,49 @@ async def run():
     
     try:
         # Create a single session for all requests
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            # Crawl with pagination
-            if urls:
-                videos = await crawler.crawl_videos(
-                    session=session,
-                    url=urls[0],
-                    download=True,
-                    headers=headers,
-                    request_delay=2.0,  # 增加延迟
-                    start_page=1,
-                    max_pages=3,  # 爬取3页
-                    page_param="page",  # URL中的页码参数名
-                    video_selector="video, source[type*=video], iframe[src*=player], a[href*='.mp4'], div[class*=video]"  # 视频元素选择器
-                )
-                
-                print(f"\nFound {len(videos)} videos in total")
-                for video in videos:
-                    print(f"\nVideo: {video['title'] or video['url']}")
-                    print(f"Type: {video['type']}")
-                    print(f"Source: {video['source']}")
-                    if video['local_path']:
-                        print(f"Saved to: {video['local_path']}")
+        connector = aiohttp.TCPConnector(
+            ssl=ssl_context,
+            limit=0,  # No global cap; pages of one site are bounded per host
+            limit_per_host=32,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            keepalive_timeout=75,  # Keep sockets open between paginated requests
+            enable_cleanup_closed=True
+        )
+        timeout = aiohttp.ClientTimeout(total=60, sock_connect=10, sock_read=30)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            # Initialize crawler
+            crawler = VideoCrawler(
+                session=session,
+                save_dir="downloaded_videos",
+                max_size_mb=500,
+                supported_types=['.mp4', '.webm', '.avi']
+            )
+            
+            try:
+                # Crawl with pagination
+                if urls:
+                    videos = await crawler.crawl_videos(
+                        url=urls[0],
+                        download=True,
+                        headers=headers,
+                        request_delay=2.0,  # 增加延迟
+                        start_page=1,
+                        max_pages=3,  # 爬取3页
+                        page_param="page",  # URL中的页码参数名
+                        video_selector="video, source[type*=video], iframe[src*=player], a[href*='.mp4'], div[class*=video]"  # 视频元素选择器
+                    )
+                    
+                    print(f"\nFound {len(videos)} videos in total")
+                    for video in videos:
+                        print(f"\nVideo: {video['title'] or video['url']}")
+                        print(f"Type: {video['type']}")
+                        print(f"Source: {video['source']}")
+                        if video['local_path']:
+                            print(f"Saved to: {video['local_path']}")
+            finally:
+                await crawler.aclose()
+                await close_connector()
     
     except Exception as e:
         print(f"Error running crawler: {e}")
@@ -318,6 +401,13 @@ def main():
         if platform.system() == 'Windows':
             # 在 Windows 上使用 ProactorEventLoop
             asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        else:
+            # Use the faster libuv-based loop when uvloop is installed
+            try:
+                import uvloop
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            except ImportError:
+                pass
         
         asyncio.run(run())
     except KeyboardInterrupt:
@@ -1,22 +1,50 @@
 """Pytest configuration file."""
 import pytest
+import pytest_asyncio
 from crawler.crawler_core import RequestManager, Spider
 from crawler.data_processor import ContentExtractor
+from crawler._net import close_connector
 import aiohttp
 import asyncio
 import platform
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
+def pytest_asyncio_loop_factories(config, item):
+    """Choose the event loop pytest-asyncio runs the tests on.
+    
+    Uses the proactor loop on Windows and uvloop elsewhere when the optional
+    test extra is installed, falling back to the default loop without it.
+    """
     if platform.system() == 'Windows':
-        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+        return {'proactor': asyncio.ProactorEventLoop}
+    try:
+        import uvloop
+    except ImportError:
+        return {'asyncio': asyncio.new_event_loop}
+    return {'uvloop': uvloop.new_event_loop}
 
-@pytest.fixture(scope="session")
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def _close_shared_connector():
+    """Close the connection pool shared by sessions the components create themselves."""
+    yield
+    await close_connector()
+
+@pytest_asyncio.fixture(scope="session")
 async def aiohttp_session():
-    """Create a session for testing."""
-    async with aiohttp.ClientSession() as session:
+    """Create a session shared by every test, so connections and DNS lookups are reused."""
+    connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
         yield session
+
+@pytest_asyncio.fixture(scope="session")
+async def shared_request_manager(aiohttp_session):
+    """Create one RequestManager for the whole test session on the shared session."""
+    manager = RequestManager(session=aiohttp_session)
+    yield manager
+    await manager.close()
+
+@pytest.fixture
+def request_manager(shared_request_manager):
+    """Get the shared RequestManager with the settings tests may change reset to their defaults."""
+    shared_request_manager.proxy = None
+    shared_request_manager.set_retry_policy(3, 1)
+    return shared_request_manager
@@ -0,0 +1,76 @@
+"""
+Test cases for ConfigManager.
+
+This module contains test cases for the ConfigManager class, which is responsible
+for loading, updating and reading configuration files.
+"""
+
+# Import built-in modules
+import json
+import os
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from crawler.config import ConfigManager
+
+@pytest.fixture
+def config_path(tmp_path) -> str:
+    """Create a configuration file in a temporary directory.
+    
+    Args:
+        tmp_path: Pytest temporary directory.
+        
+    Returns:
+        str: Path to the configuration file.
+    """
+    path = os.path.join(str(tmp_path), "config.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"name": "crawler", "spider": {"concurrency": 10}}, f)
+    return path
+
+def test_load_config(config_path: str) -> None:
+    """Test loading a configuration file."""
+    config_manager = ConfigManager()
+    config = config_manager.load_config(config_path)
+    
+    assert config == {"name": "crawler", "spider": {"concurrency": 10}}
+    assert config_manager.get_config_value("name") == "crawler"
+    assert config_manager.get_config_value("missing") is None
+
+def test_load_config_errors(tmp_path) -> None:
+    """Test that missing and invalid files raise errors."""
+    config_manager = ConfigManager()
+    with pytest.raises(FileNotFoundError):
+        config_manager.load_config(os.path.join(str(tmp_path), "missing.json"))
+    
+    invalid_path = os.path.join(str(tmp_path), "invalid.json")
+    with open(invalid_path, "w", encoding="utf-8") as f:
+        f.write("{invalid")
+    with pytest.raises(ValueError):
+        config_manager.load_config(invalid_path)
+
+def test_update_config(config_path: str) -> None:
+    """Test that updates are merged, written indented and readable again."""
+    config_manager = ConfigManager()
+    config_manager.load_config(config_path)
+    
+    assert config_manager.update_config(config_path, {"name": "爬虫"})
+    with open(config_path, encoding="utf-8") as f:
+        content = f.read()
+    assert "\n  " in content
+    assert json.loads(content) == {"name": "爬虫", "spider": {"concurrency": 10}}
+    assert config_manager.get_config_value("name") == "爬虫"
+
+def test_get_config_value_dotted_keys(config_path: str) -> None:
+    """Test looking up nested values by dotted path, including after updates."""
+    config_manager = ConfigManager()
+    config_manager.load_config(config_path)
+    
+    assert config_manager.get_config_value("spider.concurrency") == 10
+    assert config_manager.get_config_value("spider") == {"concurrency": 10}
+    
+    config_manager.update_config(config_path, {"spider": {"concurrency": 20, "delay": 1}})
+    assert config_manager.get_config_value("spider.concurrency") == 20
+    assert config_manager.get_config_value("spider.delay") == 1
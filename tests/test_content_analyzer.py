@@ -0,0 +1,87 @@
+"""
+Test cases for ContentAnalyzer.
+
+This module contains test cases for the ContentAnalyzer class, which is responsible
+for identifying important content patterns on web pages.
+"""
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from crawler._fastparse import parse
+from crawler.crawler_core.content_analyzer import ContentAnalyzer
+
+PAGE = (
+    '<html><body><nav class="menu"><ul>'
+    + ''.join(f'<li><a href="/{i}">Link {i}</a></li>' for i in range(4))
+    + '</ul></nav><main id="main"><article class="post"><p>'
+    + 'Lorem ipsum dolor sit amet ' * 20
+    + '</p></article><section><div class="pagination"><a href="?page=2">next</a></div>'
+    + '<div><span>plain</span></div></section></main></body></html>'
+)
+
+@pytest.fixture
+def content_analyzer() -> ContentAnalyzer:
+    """Create a ContentAnalyzer instance for testing.
+    
+    Returns:
+        ContentAnalyzer: The content analyzer instance.
+    """
+    return ContentAnalyzer()
+
+def test_analyze_page(content_analyzer: ContentAnalyzer) -> None:
+    """Test that semantic, class-based, density and repetition patterns are found."""
+    patterns = content_analyzer.analyze_page(PAGE)
+    found = {(pattern.selector, pattern.content_type) for pattern in patterns}
+    
+    assert ('#main', 'main') in found
+    assert ('article.post', 'article') in found
+    assert ('article.post', 'content') in found
+    assert ('div.pagination', 'pagination') in found
+    assert ('li,a', 'list') in found
+    # Elements without id or class get a positional selector
+    assert ('#main > section:nth-of-type(1)', 'section') in found
+    assert all(0 <= pattern.importance_score <= 1.0 for pattern in patterns)
+    assert [p.importance_score for p in patterns] == sorted(
+        (p.importance_score for p in patterns), reverse=True
+    )
+
+def test_get_crawl_suggestions(content_analyzer: ContentAnalyzer) -> None:
+    """Test grouping analyzed patterns into crawl suggestions."""
+    suggestions = content_analyzer.get_crawl_suggestions(content_analyzer.analyze_page(PAGE))
+    
+    assert 'article.post' in suggestions['content_selectors']
+    assert 'div.pagination' in suggestions['pagination_selectors']
+
+def test_unique_selector_positions(content_analyzer: ContentAnalyzer) -> None:
+    """Test nth-of-type paths for siblings sharing a tag, anchored at the nearest id."""
+    root = parse(
+        '<html><body><div id="list"><p>intro</p><section></section>'
+        '<section><span></span><span></span></section></div></body></html>'
+    )
+    spans = list(root.iter('span'))
+    
+    assert content_analyzer._get_unique_selector(spans[1]) == (
+        '#list > section:nth-of-type(2) > span:nth-of-type(2)'
+    )
+    assert content_analyzer._get_unique_selector(spans[0]) == (
+        '#list > section:nth-of-type(2) > span:nth-of-type(1)'
+    )
+    assert content_analyzer._get_unique_selector(root.find('body')) == 'html:nth-of-type(1) > body:nth-of-type(1)'
+
+def test_analyze_page_caches_identical_html(content_analyzer: ContentAnalyzer) -> None:
+    """Test that identical HTML is answered from the cache and the cache stays bounded."""
+    first = content_analyzer.analyze_page(PAGE)
+    second = content_analyzer.analyze_page(PAGE)
+    
+    assert second == first
+    assert second is not first
+    assert all(a is b for a, b in zip(first, second))
+    
+    content_analyzer.RESULT_CACHE_SIZE = 2
+    for i in range(3):
+        content_analyzer.analyze_page(f'<html><body><article id="a{i}"></article></body></html>')
+    assert len(content_analyzer._result_cache) == 2
+    # The oldest page was evicted, so it is analyzed again
+    assert content_analyzer.analyze_page(PAGE)[0] is not first[0]
@@ -7,15 +7,66 @@ for extracting various types of content from HTML pages.
 
 # Import built-in modules
 import os
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict
 
 # Import third-party modules
+import aiohttp
 import pytest
-from bs4 import BeautifulSoup
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from lxml import etree
 
 # Import local modules
+from crawler._fastparse import parse
 from crawler.data_processor.content_extractor import ContentExtractor, ImageInfo
 
+SAMPLE_IMAGES_HTML = """
+<html>
+    <body>
+        <img src="test.jpg" alt="Test Image">
+        <img src="test2.png" alt="Test Image 2">
+    </body>
+</html>
+"""
+
+SAMPLE_TEXT_HTML = """
+<html>
+    <body>
+        <h1>Test Title</h1>
+        <p>Test paragraph</p>
+    </body>
+</html>
+"""
+
+SAMPLE_STRUCTURED_HTML = """
+<html>
+    <head>
+        <title>Test Page</title>
+        <meta name="description" content="Test description">
+    </head>
+    <body>
+        <h1>Test Title</h1>
+    </body>
+</html>
+"""
+
+SAMPLE_VIDEOS_HTML = """
+<html>
+    <body>
+        <!-- Video with single source -->
+        <video width="320" height="240" controls>
+            <source src="https://www.w3schools.com/tags/movie.mp4" type="video/mp4">
+            Your browser does not support the video tag.
+        </video>
+
+        <!-- Direct video tag -->
+        <video src="https://www.w3schools.com/html/horse.ogg" controls>
+            Your browser does not support the video element.
+        </video>
+    </body>
+</html>
+"""
+
 @pytest.fixture
 async def content_extractor() -> AsyncGenerator[ContentExtractor, None]:
     """Create a ContentExtractor instance for testing.
@@ -27,63 +78,52 @@ async def content_extractor() -> AsyncGenerator[ContentExtractor, None]:
     yield extractor
     await extractor.close()
 
+@pytest.fixture(scope="session")
+def parsed_samples() -> Dict[str, etree._Element]:
+    """Parse the sample pages once for the whole test session.
+    
+    Extraction does not modify the tree, so the parsed documents can be shared.
+    
+    Returns:
+        Dict[str, etree._Element]: Parsed sample documents by name.
+    """
+    return {
+        "images": parse(SAMPLE_IMAGES_HTML),
+        "text": parse(SAMPLE_TEXT_HTML),
+        "structured": parse(SAMPLE_STRUCTURED_HTML),
+        "videos": parse(SAMPLE_VIDEOS_HTML)
+    }
+
 @pytest.mark.asyncio
 async def test_content_extractor_init(content_extractor: ContentExtractor) -> None:
     """Test ContentExtractor initialization."""
     assert content_extractor is not None
 
 @pytest.mark.asyncio
-async def test_extract_images(content_extractor: ContentExtractor) -> None:
+async def test_extract_images(content_extractor: ContentExtractor, parsed_samples: Dict[str, etree._Element]) -> None:
     """Test image extraction functionality."""
-    html = """
-    <html>
-        <body>
-            <img src="test.jpg" alt="Test Image">
-            <img src="test2.png" alt="Test Image 2">
-        </body>
-    </html>
-    """
-    images = await content_extractor.extract_images(html, "http://example.com", download=False)
+    images = await content_extractor.extract_images(parsed_samples["images"], "http://example.com", download=False)
     assert len(images) == 2
     assert all(isinstance(img, ImageInfo) for img in images)
     assert all(img.url.startswith("http://example.com") for img in images)
 
 @pytest.mark.asyncio
-async def test_extract_text(content_extractor: ContentExtractor) -> None:
+async def test_extract_text(content_extractor: ContentExtractor, parsed_samples: Dict[str, etree._Element]) -> None:
     """Test text extraction functionality."""
-    html = """
-    <html>
-        <body>
-            <h1>Test Title</h1>
-            <p>Test paragraph</p>
-        </body>
-    </html>
-    """
-    text = await content_extractor.extract_text(html)
+    text = await content_extractor.extract_text(parsed_samples["text"])
     assert "Test Title" in text
     assert "Test paragraph" in text
 
 @pytest.mark.asyncio
-async def test_extract_structured_data(content_extractor: ContentExtractor) -> None:
+async def test_extract_structured_data(content_extractor: ContentExtractor, parsed_samples: Dict[str, etree._Element]) -> None:
     """Test structured data extraction functionality."""
-    html = """
-    <html>
-        <head>
-            <title>Test Page</title>
-            <meta name="description" content="Test description">
-        </head>
-        <body>
-            <h1>Test Title</h1>
-        </body>
-    </html>
-    """
-    data = await content_extractor.extract_structured_data(html)
+    data = await content_extractor.extract_structured_data(parsed_samples["structured"])
     assert data["title"] == "Test Page"
     assert data["meta_description"] == "Test description"
     assert "Test Title" in data["headings"]["h1"]
 
 @pytest.mark.asyncio
-async def test_extract_videos(content_extractor: ContentExtractor) -> None:
+async def test_extract_videos(content_extractor: ContentExtractor, parsed_samples: Dict[str, etree._Element]) -> None:
     """
     Test video extraction functionality.
     
@@ -92,25 +132,9 @@ async def test_extract_videos(content_extractor: ContentExtractor) -> None:
     2. Videos with multiple sources
     3. Different video formats (mp4, ogg)
     """
-    html = """
-    <html>
-        <body>
-            <!-- Video with single source -->
-            <video width="320" height="240" controls>
-                <source src="https://www.w3schools.com/tags/movie.mp4" type="video/mp4">
-                Your browser does not support the video tag.
-            </video>
-            
-            <!-- Direct video tag -->
-            <video src="https://www.w3schools.com/html/horse.ogg" controls>
-                Your browser does not support the video element.
-            </video>
-        </body>
-    </html>
-    """
     
     videos = await content_extractor.extract_videos(
-        html=html,
+        html=parsed_samples["videos"],
         base_url="https://www.w3schools.com",
         download=False
     )
@@ -132,3 +156,91 @@ async def test_extract_videos(content_extractor: ContentExtractor) -> None:
     assert horse_video is not None
     assert horse_video["type"] == ".ogg"
     assert horse_video["source"] == "video"
+
+@pytest.mark.asyncio
+async def test_extract_videos_from_parsed_document(content_extractor: ContentExtractor) -> None:
+    """Test that an already parsed document gives the same result as its HTML."""
+    html = '<html><body><video src="/media/clip.mp4" width="640"></video></body></html>'
+    
+    from_html = await content_extractor.extract_videos(html=html, base_url="https://example.com")
+    from_tree = await content_extractor.extract_videos(html=parse(html), base_url="https://example.com")
+    
+    assert from_tree == from_html
+    assert from_tree[0]["url"] == "https://example.com/media/clip.mp4"
+
+@pytest.mark.asyncio
+async def test_extract_from_large_page(content_extractor: ContentExtractor) -> None:
+    """Test that extraction stays complete and in document order on a page with many elements."""
+    items = "".join(
+        f'<div class="item"><img src="/img/{i}.jpg" alt="Image {i}">'
+        f'<video><source src="/video/{i}.mp4" type="video/mp4"></video><p>Caption {i}</p></div>'
+        for i in range(2000)
+    )
+    html = f"<html><head><title>Gallery</title></head><body>{items}</body></html>"
+    
+    images = await content_extractor.extract_images(html, "https://example.com", download=False)
+    assert [img.url for img in images] == [f"https://example.com/img/{i}.jpg" for i in range(2000)]
+    
+    videos = await content_extractor.extract_videos(html=html, base_url="https://example.com")
+    assert [v["url"] for v in videos] == [f"https://example.com/video/{i}.mp4" for i in range(2000)]
+    
+    text = await content_extractor.extract_text(html)
+    assert "Caption 0" in text and "Caption 1999" in text
+
+@pytest.mark.asyncio
+async def test_extractors_share_parsed_document(content_extractor: ContentExtractor) -> None:
+    """Test that one parsed document can be reused by every extractor without being modified."""
+    html = """
+    <html>
+        <head><title>Shared</title><script>var skipped = 1;</script></head>
+        <body><h1>Heading</h1><p>Body text</p><img src="/a.png" alt="A"></body>
+    </html>
+    """
+    root = parse(html)
+    
+    assert await content_extractor.extract_text(root) == await content_extractor.extract_text(html)
+    assert "skipped" not in await content_extractor.extract_text(root)
+    assert await content_extractor.extract_structured_data(root) == await content_extractor.extract_structured_data(html)
+    images = await content_extractor.extract_images(root, base_url="https://example.com")
+    assert images[0].url == "https://example.com/a.png"
+    
+    # Text extraction must not strip scripts from the shared tree
+    assert len(root.xpath('//script')) == 1
+
+@pytest.mark.asyncio
+async def test_context_manager_closes_session() -> None:
+    """Test that leaving the context closes the download session."""
+    async with ContentExtractor() as extractor:
+        session = await extractor._get_session()
+        assert await extractor._get_session() is session
+    
+    assert session.closed
+    assert extractor._session is None
+
+@pytest.mark.asyncio
+async def test_close_leaves_injected_session_open(aiohttp_session: aiohttp.ClientSession) -> None:
+    """Test that closing the extractor does not close a session passed in by the caller."""
+    extractor = ContentExtractor(session=aiohttp_session)
+    assert await extractor._get_session() is aiohttp_session
+    await extractor.close()
+    assert not aiohttp_session.closed
+
+@pytest.mark.asyncio
+async def test_failed_image_download_leaves_no_file(tmp_path, aiohttp_session: aiohttp.ClientSession) -> None:
+    """Test that an image whose size cannot be read is not left in the save directory."""
+    async def broken_image(request: web.Request) -> web.Response:
+        return web.Response(body=b"not an image", content_type="image/png")
+    
+    app = web.Application()
+    app.router.add_get("/broken.png", broken_image)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        extractor = ContentExtractor(session=aiohttp_session)
+        html = f'<html><body><img src="{server.make_url("/broken.png")}"></body></html>'
+        images = await extractor.extract_images(html, "http://example.com", download=True, save_dir=str(tmp_path))
+    finally:
+        await server.close()
+    
+    assert images[0].file_path is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,94 @@
+"""
+Test cases for DataClassifier.
+
+This module contains test cases for the DataClassifier class, which is responsible
+for keyword-based content classification.
+"""
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from crawler.data_processor.data_classifier import DataClassifier
+
+@pytest.fixture
+def classifier() -> DataClassifier:
+    """Create a DataClassifier with sample categories.
+    
+    Returns:
+        DataClassifier: The classifier instance.
+    """
+    data_classifier = DataClassifier()
+    data_classifier.add_category("tech", ["python", "java", "javascript"])
+    data_classifier.add_category("sports", ["football", "tennis"])
+    return data_classifier
+
+def test_classify_requires_categories() -> None:
+    """Test that classification fails without categories."""
+    with pytest.raises(ValueError):
+        DataClassifier().classify("anything")
+
+def test_classify_best_match(classifier: DataClassifier) -> None:
+    """Test that the category with the most matched keywords wins."""
+    assert classifier.classify("I write python and javascript") == "tech"
+    assert classifier.classify("football and tennis on python night") == "sports"
+
+def test_classify_counts_distinct_keywords(classifier: DataClassifier) -> None:
+    """Test that repeated occurrences of one keyword count once."""
+    assert classifier.classify("tennis tennis tennis, python and java") == "tech"
+
+def test_classify_default_category(classifier: DataClassifier) -> None:
+    """Test that the first category is returned when nothing matches."""
+    assert classifier.classify("nothing relevant here") == "tech"
+
+def test_update_keywords_refreshes_matching(classifier: DataClassifier) -> None:
+    """Test that keyword updates are reflected in classification."""
+    assert classifier.classify("golf") == "tech"
+    assert classifier.update_keywords("sports", ["golf"])
+    assert classifier.classify("golf") == "sports"
+    assert classifier.update_keywords("sports", ["golf"], mode="remove")
+    assert classifier.classify("golf") == "tech"
+
+def test_train_adds_keywords(classifier: DataClassifier) -> None:
+    """Test that training data extends category keywords."""
+    classifier.train([("marathon running", "sports")])
+    assert classifier.classify("a marathon") == "sports"
+
+def test_classify_cache_invalidated_on_update(classifier: DataClassifier) -> None:
+    """Test that cached results do not survive keyword changes."""
+    content = "a day of golf"
+    assert classifier.classify(content) == "tech"
+    assert classifier.classify(content) == "tech"
+    classifier.update_keywords("sports", ["golf"])
+    assert classifier.classify(content) == "sports"
+
+def test_remove_category_updates_default(classifier: DataClassifier) -> None:
+    """Test that removing the first category moves the default to the next one."""
+    assert classifier.remove_category("tech")
+    assert classifier.get_categories() == ["sports"]
+    assert classifier.classify("nothing relevant here") == "sports"
+
+def test_classify_batch(classifier: DataClassifier) -> None:
+    """Test that batch classification matches single classification in order."""
+    contents = ["python and java", "football", "nothing", "python and java"]
+    assert classifier.classify_batch(contents) == [classifier.classify(c) for c in contents]
+    assert classifier.classify_batch([]) == []
+
+def test_train_records_data_and_keywords(classifier: DataClassifier) -> None:
+    """Test that training stores the pairs and learns keywords for known labels."""
+    training_data = [("golf putting green", "sports"), ("rust compiler", "tech"), ("misc", "other")]
+    classifier.train(training_data)
+    assert classifier.training_data == training_data
+    assert "golf" in classifier.categories["sports"]
+    assert "other" not in classifier.categories
+    assert classifier.classify("putting on the green") == "sports"
+
+def test_bulk_update(classifier: DataClassifier) -> None:
+    """Test that bulk updates apply to known categories and are matched after a flush."""
+    applied = classifier.bulk_update([("sports", ["golf", "rugby"]), ("unknown", ["x"]), ("tech", ["rust"])])
+    assert applied == 2
+    classifier.flush()
+    assert classifier.classify("golf and rugby") == "sports"
+    assert classifier.classify("rust") == "tech"
+    with pytest.raises(ValueError):
+        classifier.bulk_update([("sports", ["golf"])], mode="replace")
@@ -0,0 +1,161 @@
+"""
+Test cases for DataStorage.
+
+This module contains test cases for the DataStorage class, which is responsible
+for storing and retrieving crawled data.
+"""
+
+# Import built-in modules
+import asyncio
+import json
+import os
+from datetime import date
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from crawler.data_processor.data_storage import DataStorage
+
+@pytest.fixture
+def data_storage(tmp_path) -> DataStorage:
+    """Create a DataStorage instance in a temporary directory.
+    
+    Args:
+        tmp_path: Pytest temporary directory.
+        
+    Returns:
+        DataStorage: The data storage instance.
+    """
+    return DataStorage(str(tmp_path))
+
+@pytest.mark.asyncio
+async def test_save_and_retrieve(data_storage: DataStorage) -> None:
+    """Test saving items and retrieving them by query."""
+    assert await data_storage.save({"url": "http://example.com/1", "title": "一"}, "news")
+    assert await data_storage.save({"url": "http://example.com/2", "title": "二"}, "news")
+    
+    items = await data_storage.retrieve({"category": "news"})
+    assert [item["url"] for item in items] == ["http://example.com/1", "http://example.com/2"]
+    
+    items = await data_storage.retrieve({"category": "news", "title": "二"})
+    assert len(items) == 1
+    assert items[0]["url"] == "http://example.com/2"
+    
+    assert await data_storage.retrieve({"category": "missing"}) == []
+    assert await data_storage.retrieve({}) == []
+
+@pytest.mark.asyncio
+async def test_update(data_storage: DataStorage) -> None:
+    """Test updating items matching a query."""
+    await data_storage.save({"url": "http://example.com/1", "read": False}, "news")
+    await data_storage.save({"url": "http://example.com/2", "read": False}, "news")
+    
+    assert await data_storage.update({"category": "news", "url": "http://example.com/2"}, {"read": True})
+    assert not await data_storage.update({"category": "news", "url": "http://example.com/3"}, {"read": True})
+    
+    items = await data_storage.retrieve({"category": "news", "read": True})
+    assert [item["url"] for item in items] == ["http://example.com/2"]
+    assert len(await data_storage.retrieve({"category": "news"})) == 2
+
+@pytest.mark.asyncio
+async def test_migrate_json_files(data_storage: DataStorage) -> None:
+    """Test converting old JSON array files to NDJSON."""
+    legacy_path = os.path.join(data_storage.storage_dir, "old.json")
+    with open(legacy_path, "w", encoding="utf-8") as f:
+        json.dump([{"url": "http://example.com/1"}, {"url": "http://example.com/2"}], f)
+    
+    assert await data_storage.migrate_json_files() == 1
+    assert not os.path.exists(legacy_path)
+    assert len(await data_storage.retrieve({"category": "old"})) == 2
+
+@pytest.mark.asyncio
+async def test_index_tracks_saves_and_updates(data_storage: DataStorage) -> None:
+    """Test that indexed queries see items saved and updated after the index was built."""
+    await data_storage.save({"url": "http://example.com/1", "tags": ["a"], "site": "x"}, "news")
+    assert len(await data_storage.retrieve({"category": "news", "site": "x"})) == 1
+    
+    await data_storage.save({"url": "http://example.com/2", "tags": ["b"], "site": "x"}, "news")
+    items = await data_storage.retrieve({"category": "news", "site": "x", "tags": ["b"]})
+    assert [item["url"] for item in items] == ["http://example.com/2"]
+    
+    assert await data_storage.update({"category": "news", "url": "http://example.com/1"}, {"site": "y"})
+    assert [item["url"] for item in await data_storage.retrieve({"category": "news", "site": "y"})] == [
+        "http://example.com/1"
+    ]
+    assert await data_storage.retrieve({"category": "news", "site": "z"}) == []
+    assert await data_storage.retrieve({"category": "news", "missing": 1}) == []
+
+@pytest.mark.asyncio
+async def test_index_uses_stored_form_of_values(data_storage: DataStorage) -> None:
+    """Test that saved and updated items are indexed by the values written to disk."""
+    await data_storage.save({"id": 1, "when": date(2024, 1, 1)}, "events")
+    assert len(await data_storage.retrieve({"category": "events", "id": 1})) == 1
+    
+    # Dates are stored as ISO strings, so that is what queries match against
+    await data_storage.save({"id": 2, "when": date(2024, 1, 2)}, "events")
+    assert [item["id"] for item in await data_storage.retrieve({"category": "events", "when": "2024-01-02"})] == [2]
+    
+    assert await data_storage.update({"category": "events", "id": 1}, {"when": date(2024, 2, 1)})
+    assert [item["id"] for item in await data_storage.retrieve({"category": "events", "when": "2024-02-01"})] == [1]
+    
+    # A fresh instance building its index from the file agrees
+    reopened = DataStorage(data_storage.storage_dir)
+    assert [item["id"] for item in await reopened.retrieve({"category": "events", "when": "2024-02-01"})] == [1]
+
+@pytest.mark.asyncio
+async def test_save_during_index_build_is_indexed(data_storage: DataStorage) -> None:
+    """Test that an item saved while the index is being built shows up in indexed queries."""
+    category_path = data_storage._get_category_path("news")
+    with open(category_path, "wb") as f:
+        f.write(b"".join(b'{"id":%d}\n' % i for i in range(20000)))
+    # Yield to the event loop after every line, so the save lands mid-build
+    data_storage.SCAN_BATCH = 1
+    
+    build = asyncio.ensure_future(data_storage.retrieve({"category": "news", "id": 0}))
+    # The build scans once the file is mapped
+    while category_path not in data_storage._mmaps:
+        await asyncio.sleep(0.001)
+    await data_storage.save({"id": 20000}, "news")
+    assert len(await build) == 1
+    
+    assert [item["id"] for item in await data_storage.retrieve({"category": "news", "id": 20000})] == [20000]
+    assert len(await data_storage.retrieve({"category": "news"})) == 20001
+
+@pytest.mark.asyncio
+async def test_iter_retrieve(data_storage: DataStorage) -> None:
+    """Test streaming matches and stopping early."""
+    for i in range(5):
+        await data_storage.save({"url": f"http://example.com/{i}", "even": i % 2 == 0}, "news")
+    
+    urls = []
+    async for item in data_storage.iter_retrieve({"category": "news", "even": True}):
+        urls.append(item["url"])
+        if len(urls) == 2:
+            break
+    assert urls == ["http://example.com/0", "http://example.com/2"]
+    
+    assert [item async for item in data_storage.iter_retrieve({"category": "missing"})] == []
+
+@pytest.mark.asyncio
+async def test_retrieve_empty_file_then_save(data_storage: DataStorage) -> None:
+    """Test that empty category files are handled and new saves become visible."""
+    open(os.path.join(data_storage.storage_dir, "empty.ndjson"), "wb").close()
+    assert await data_storage.retrieve({"category": "empty"}) == []
+    
+    await data_storage.save({"url": "http://example.com/1"}, "empty")
+    assert [item["url"] for item in await data_storage.retrieve({"category": "empty"})] == [
+        "http://example.com/1"
+    ]
+
+@pytest.mark.asyncio
+async def test_export_pretty(data_storage: DataStorage, tmp_path) -> None:
+    """Test exporting a category as an indented JSON array."""
+    await data_storage.save({"url": "http://example.com/1", "title": "一"}, "news")
+    out_path = str(tmp_path / "news_export.json")
+    
+    assert await data_storage.export_pretty("news", out_path) == 1
+    with open(out_path, encoding="utf-8") as f:
+        content = f.read()
+    assert json.loads(content) == [{"url": "http://example.com/1", "title": "一"}]
+    assert "\n  " in content
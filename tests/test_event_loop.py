@@ -0,0 +1,31 @@
+"""
+Test cases for the test event loop configuration.
+
+This module checks that the pytest_asyncio_loop_factories hook in conftest.py
+chooses the loop pytest-asyncio runs the tests on.
+"""
+
+# Import built-in modules
+import asyncio
+import platform
+
+# Import third-party modules
+import pytest
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(platform.system() == 'Windows', reason="uvloop is not used on Windows")
+async def test_runs_on_uvloop_when_installed() -> None:
+    """Test that the running loop is uvloop's when the test extra is installed."""
+    uvloop = pytest.importorskip("uvloop")
+    assert isinstance(asyncio.get_running_loop(), uvloop.Loop)
+
+@pytest.mark.asyncio
+async def test_runs_on_hook_loop(request: pytest.FixtureRequest) -> None:
+    """Test that the running loop comes from the configured loop factory."""
+    factories = request.config.hook.pytest_asyncio_loop_factories(config=request.config, item=request.node)
+    assert len(factories) == 1
+    expected = next(iter(factories.values()))()
+    try:
+        assert type(asyncio.get_running_loop()) is type(expected)
+    finally:
+        expected.close()
@@ -0,0 +1,35 @@
+"""
+Test cases for the lxml parsing helpers.
+
+This module contains test cases for the helpers in crawler._fastparse, which
+are used on hot parsing paths instead of BeautifulSoup.
+"""
+
+# Import local modules
+from crawler._fastparse import get_text, get_visible_text, iter_elements, parse
+
+def test_parse_and_get_text() -> None:
+    """Test parsing documents, including ones lxml rejects as str."""
+    root = parse('<?xml version="1.0" encoding="utf-8"?><html><body><p> 你好 </p><p>world</p></body></html>')
+    assert get_text(root, separator=' ') == '你好 world'
+    assert get_text(parse('')) == ''
+
+def test_get_visible_text_skips_scripts_and_styles() -> None:
+    """Test that script, style and comment contents are left out of the text."""
+    root = parse('<html><head><style>p {}</style></head><body> a <script>x = 1</script>b<!--c--><p>d</p></body></html>')
+    assert get_visible_text(root, separator=' ') == 'a b d'
+    assert get_visible_text(root, strip=False) == ' a bd'
+    assert len(root.xpath('//script')) == 1
+
+def test_iter_elements_streams_matching_tags() -> None:
+    """Test that matching elements are yielded in order with attributes and text."""
+    html = '<html><body>' + ''.join(
+        f'<div class="item"><img src="{i}.png"><script>var n = {i};</script></div>' for i in range(50)
+    ) + '</body></html>'
+    
+    found = [
+        element.get('src') or element.text
+        for element in iter_elements(html, ('img', 'script'), chunk_size=64)
+    ]
+    assert found[:4] == ['0.png', 'var n = 0;', '1.png', 'var n = 1;']
+    assert len(found) == 100
@@ -0,0 +1,173 @@
+"""
+Test cases for PerformanceMonitor.
+
+This module contains test cases for the PerformanceMonitor class, which is responsible
+for recording performance metrics and computing statistics over them.
+"""
+
+# Import built-in modules
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from crawler.monitor.performance_monitor import PerformanceMonitor, _MetricSeries
+
+@pytest.fixture
+def metrics_file(tmp_path) -> str:
+    """Get a metrics file path in a temporary directory.
+    
+    Args:
+        tmp_path: Pytest temporary directory.
+        
+    Returns:
+        str: Path of the metrics file.
+    """
+    return str(tmp_path / "metrics.ndjson")
+
+@pytest.mark.asyncio
+async def test_record_metrics_and_statistics(metrics_file: str) -> None:
+    """Test recording metrics and computing statistics for a time range."""
+    monitor = PerformanceMonitor(metrics_file)
+    start = datetime.now()
+    for crawl_time in (1.0, 2.0, 6.0):
+        await monitor.record_metrics({'crawl_time': crawl_time, 'success': True})
+    await monitor.record_metrics({'success': False})
+    end = datetime.now()
+    await monitor.close()
+    
+    stats = monitor.get_statistics('crawl_time', (start, end))
+    assert stats == {'count': 3, 'average': 3.0, 'min': 1.0, 'max': 6.0}
+    assert monitor.get_statistics('crawl_time', (end + timedelta(seconds=1), end + timedelta(seconds=2))) == {}
+    assert monitor.get_statistics('missing', (start, end)) == {}
+
+@pytest.mark.asyncio
+async def test_metrics_are_appended_and_reloaded(metrics_file: str) -> None:
+    """Test that each record is one NDJSON line and that records survive a restart."""
+    async with PerformanceMonitor(metrics_file) as monitor:
+        await monitor.record_metrics({'crawl_time': 1.5})
+        await monitor.record_metrics({'crawl_time': 2.5})
+    
+    with open(metrics_file, 'rb') as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 2
+    
+    # A line cut short by a crash is skipped on load
+    with open(metrics_file, 'ab') as f:
+        f.write(b'{"2024-01-01T00:00:00": {"crawl_')
+    
+    reloaded = PerformanceMonitor(metrics_file)
+    stats = reloaded.get_statistics('crawl_time', (datetime.min, datetime.max))
+    assert stats == {'count': 2, 'average': 2.0, 'min': 1.5, 'max': 2.5}
+
+@pytest.mark.asyncio
+async def test_unserializable_record_is_not_counted(metrics_file: str) -> None:
+    """Test that a record which cannot be written is left out of the statistics too."""
+    async with PerformanceMonitor(metrics_file) as monitor:
+        await monitor.record_metrics({'crawl_time': 1.0})
+        await monitor.record_metrics({'crawl_time': 2.0, 'response': object()})
+    
+    stats = monitor.get_statistics('crawl_time', (datetime.min, datetime.max))
+    assert stats['count'] == 1
+    assert PerformanceMonitor(metrics_file).get_statistics('crawl_time', (datetime.min, datetime.max)) == stats
+
+@pytest.mark.asyncio
+async def test_concurrent_records_are_batched(metrics_file: str) -> None:
+    """Test that records from concurrent tasks are all written once flushed."""
+    monitor = PerformanceMonitor(metrics_file)
+    await asyncio.gather(*(monitor.record_metrics({'crawl_time': float(i)}) for i in range(200)))
+    await monitor.flush()
+    
+    with open(metrics_file, 'rb') as f:
+        assert len(f.read().splitlines()) == 200
+    
+    await monitor.close()
+    # Recording again after close starts a new writer
+    await monitor.record_metrics({'crawl_time': 1.0})
+    await monitor.close()
+    with open(metrics_file, 'rb') as f:
+        assert len(f.read().splitlines()) == 201
+
+@pytest.mark.asyncio
+async def test_statistics_bounds_and_out_of_order_times(metrics_file: str) -> None:
+    """Test inclusive range bounds, including records whose clock went backwards."""
+    monitor = PerformanceMonitor(metrics_file)
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    for offset, value in ((0, 1), (10, 2), (5, 3), (20, 4)):
+        monitor._add_record((base + timedelta(seconds=offset)).timestamp(), {'pages': value})
+    
+    stats = monitor.get_statistics('pages', (base + timedelta(seconds=5), base + timedelta(seconds=10)))
+    assert stats == {'count': 2, 'average': 2.5, 'min': 2, 'max': 3}
+    assert monitor.get_statistics('pages', (base, base + timedelta(seconds=20)))['count'] == 4
+
+def test_metric_series_matches_full_scan() -> None:
+    """Test that the precomputed range aggregates agree with scanning the window."""
+    class SmallBlockSeries(_MetricSeries):
+        """Series with tiny blocks, so queries span many of them."""
+        BLOCK_SIZE = 8
+    
+    rng = random.Random(7)
+    series = SmallBlockSeries()
+    recorded = []
+    for i in range(300):
+        # Every so often the clock steps back a little
+        timestamp = i - 3.5 if i % 50 == 49 else float(i)
+        value = rng.randint(-100, 100)
+        series.add(timestamp, value)
+        recorded.append((timestamp, value))
+    recorded.sort(key=lambda record: record[0])
+    
+    for _ in range(200):
+        start = rng.uniform(-5, 305)
+        end = start + rng.uniform(0, 100)
+        window = [value for timestamp, value in recorded if start <= timestamp <= end]
+        expected = {} if not window else {
+            'count': len(window),
+            'average': sum(window) / len(window),
+            'min': min(window),
+            'max': max(window)
+        }
+        assert series.statistics(start, end) == pytest.approx(expected)
+
+def test_metric_series_keeps_most_recent_samples() -> None:
+    """Test that a bounded series drops its oldest values and still aggregates correctly."""
+    class SmallBlockSeries(_MetricSeries):
+        """Series with tiny blocks, so trimming happens often."""
+        BLOCK_SIZE = 8
+    
+    rng = random.Random(11)
+    series = SmallBlockSeries(max_samples=20)
+    recorded = []
+    for i in range(500):
+        value = rng.uniform(-50, 50)
+        series.add(float(i), value)
+        recorded.append((float(i), value))
+        assert len(series.values) < 20 + SmallBlockSeries.BLOCK_SIZE
+    
+    assert len(series.values) >= 20
+    kept = recorded[-len(series.values):]
+    assert list(series.times) == [timestamp for timestamp, _ in kept]
+    for _ in range(100):
+        start = rng.uniform(460, 500)
+        end = start + rng.uniform(0, 20)
+        window = [value for timestamp, value in kept if start <= timestamp <= end]
+        expected = {} if not window else {
+            'count': len(window),
+            'average': sum(window) / len(window),
+            'min': min(window),
+            'max': max(window)
+        }
+        assert series.statistics(start, end) == pytest.approx(expected)
+
+def test_metric_series_with_non_numeric_values() -> None:
+    """Test that series with non-numeric values fall back to scanning."""
+    series = _MetricSeries()
+    series.add(1.0, 'http://example.com/a')
+    series.add(2.0, 'http://example.com/b')
+    
+    assert series.statistics(5.0, 6.0) == {}
+    with pytest.raises(TypeError):
+        series.statistics(0.0, 3.0)
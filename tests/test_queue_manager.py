@@ -0,0 +1,52 @@
+"""
+Test cases for QueueManager.
+
+This module contains test cases for the QueueManager class, which is responsible
+for queuing crawling tasks.
+"""
+
+# Import built-in modules
+import asyncio
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from crawler.task_manager.queue_manager import QueueManager
+
+@pytest.mark.asyncio
+async def test_push_pop_and_status() -> None:
+    """Test that tasks come out in order and the status tracks queued and active tasks."""
+    queue_manager = QueueManager()
+    task = {'url': 'https://example.com'}
+    assert await queue_manager.push_task(task)
+    assert await queue_manager.push_task(task)
+    assert queue_manager.get_queue_status() == {'queue_size': 2, 'active_tasks': 0}
+    
+    assert await queue_manager.pop_task() is task
+    assert queue_manager.get_queue_status() == {'queue_size': 1, 'active_tasks': 1}
+    assert queue_manager.queue_size == queue_manager.active_tasks_count == 1
+    
+    queue_manager.task_done()
+    assert queue_manager.get_queue_status() == {'queue_size': 1, 'active_tasks': 0}
+
+@pytest.mark.asyncio
+async def test_push_tasks_and_pop_batch() -> None:
+    """Test batch operations keep queue order and never return an empty batch."""
+    queue_manager = QueueManager()
+    assert await queue_manager.push_tasks({'url': f'https://example.com/{i}'} for i in range(5))
+    
+    first = await queue_manager.pop_batch(3)
+    rest = await queue_manager.pop_batch(10)
+    assert [task['url'][-1] for task in first + rest] == ['0', '1', '2', '3', '4']
+    assert len(first) == 3
+    assert queue_manager.active_tasks_count == 5
+    queue_manager.task_done(len(first))
+    assert queue_manager.active_tasks_count == 2
+    
+    # An empty queue waits for the next task instead of returning nothing
+    waiter = asyncio.ensure_future(queue_manager.pop_batch(10))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    await queue_manager.push_task({'url': 'https://example.com/late'})
+    assert await waiter == [{'url': 'https://example.com/late'}]
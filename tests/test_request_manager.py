@@ -11,20 +11,30 @@ from typing import AsyncGenerator
 # Import third-party modules
 import pytest
 import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
 # Import local modules
 from crawler.crawler_core.request_manager import RequestManager
 
+async def _echo_page(request: web.Request) -> web.Response:
+    """Serve a small HTML page echoing the Accept-Language request header."""
+    language = request.headers.get("Accept-Language", "")
+    return web.Response(text=f"<html><body>{language}</body></html>", content_type="text/html")
+
 @pytest.fixture
-async def request_manager() -> AsyncGenerator[RequestManager, None]:
-    """Create a RequestManager instance for testing.
+async def mock_server() -> AsyncGenerator[TestServer, None]:
+    """Start an in-process HTTP server so request tests do not need the network.
     
     Yields:
-        RequestManager: The request manager instance.
+        TestServer: The running test server.
     """
-    manager = RequestManager()
-    yield manager
-    await manager.close()
+    app = web.Application()
+    app.router.add_get("/", _echo_page)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
 
 @pytest.mark.asyncio
 async def test_request_manager_init(request_manager: RequestManager) -> None:
@@ -36,13 +46,23 @@ async def test_request_manager_init(request_manager: RequestManager) -> None:
     assert request_manager.delay == 1
 
 @pytest.mark.asyncio
-async def test_request_manager_get(request_manager: RequestManager) -> None:
+async def test_request_manager_get(request_manager: RequestManager, mock_server: TestServer) -> None:
     """Test GET request functionality."""
-    url = "https://www.google.com.hk/"
+    url = str(mock_server.make_url("/"))
     response = await request_manager.make_request(url)
     assert isinstance(response, str)
     assert "html" in response.lower()
 
+@pytest.mark.asyncio
+async def test_request_manager_leaves_shared_session_open(
+    aiohttp_session: aiohttp.ClientSession, mock_server: TestServer
+) -> None:
+    """Test that closing a manager does not close a session passed in by the caller."""
+    manager = RequestManager(session=aiohttp_session)
+    await manager.make_request(str(mock_server.make_url("/")))
+    await manager.close()
+    assert not aiohttp_session.closed
+
 @pytest.mark.asyncio
 async def test_request_manager_set_proxy(request_manager: RequestManager) -> None:
     """Test proxy setting functionality."""
@@ -60,10 +80,11 @@ async def test_request_manager_set_retry_policy(request_manager: RequestManager)
     assert request_manager.delay == delay
 
 @pytest.mark.asyncio
-async def test_request_manager_with_custom_headers(request_manager: RequestManager) -> None:
+async def test_request_manager_with_custom_headers(request_manager: RequestManager, mock_server: TestServer) -> None:
     """Test request with custom headers."""
-    url = "https://www.google.com.hk/"
+    url = str(mock_server.make_url("/"))
     custom_headers = {"Accept-Language": "zh-CN,zh;q=0.9"}
     response = await request_manager.make_request(url, headers=custom_headers)
     assert isinstance(response, str)
     assert "html" in response.lower()
+    assert "zh-CN,zh;q=0.9" in response
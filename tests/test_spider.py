@@ -6,6 +6,8 @@ for crawling web pages.
 """
 
 # Import built-in modules
+import asyncio
+import gc
 from typing import AsyncGenerator, Dict, Any
 from unittest.mock import Mock, patch
 
@@ -17,17 +19,6 @@ import aiohttp
 from crawler.crawler_core.spider import Spider
 from crawler.crawler_core.request_manager import RequestManager
 
-@pytest.fixture
-async def request_manager() -> AsyncGenerator[RequestManager, None]:
-    """Create a RequestManager instance for testing.
-    
-    Yields:
-        RequestManager: The request manager instance.
-    """
-    manager = RequestManager()
-    yield manager
-    await manager.close()
-
 @pytest.fixture
 async def spider(request_manager: RequestManager) -> AsyncGenerator[Spider, None]:
     """Create a Spider instance for testing.
@@ -93,3 +84,70 @@ async def test_spider_crawl_with_mock() -> None:
         assert "title" in result["parsed_data"]
         assert result["parsed_data"]["title"] == "Test Page"
         assert len(result["parsed_data"]["links"]) == 2
+
+@pytest.mark.asyncio
+async def test_spider_crawl_with_pagination_with_mock() -> None:
+    """Test paginated crawling with mocked requests."""
+    html_content = "<html><head><title>Page</title></head><body></body></html>"
+    
+    request_manager = RequestManager()
+    with patch.object(request_manager, 'make_request', return_value=html_content):
+        spider = Spider(request_manager, concurrency=2)
+        results = await spider.crawl_with_pagination(
+            base_url="http://example.com/list",
+            page_parser=lambda html: ["http://example.com/a", "http://example.com/b"],
+            max_pages=2
+        )
+        
+        assert len(results) == 4
+        assert {r["url"] for r in results} == {"http://example.com/a", "http://example.com/b"}
+
+@pytest.mark.asyncio
+async def test_spider_dedupe_content_with_mock() -> None:
+    """Test that pages with already seen content are flagged as duplicates."""
+    request_manager = RequestManager()
+    spider = Spider(request_manager, dedupe_content=True)
+    with patch.object(request_manager, 'make_request', return_value="<p>Views: 10</p>"):
+        first = await spider.crawl("http://example.com/a")
+    with patch.object(request_manager, 'make_request', return_value="<p>Views: 42</p>"):
+        second = await spider.crawl("http://example.com/b")
+    
+    assert "parsed_data" in first
+    assert second["duplicate"] is True
+    assert "parsed_data" not in second
+
+@pytest.mark.asyncio
+async def test_spider_pagination_retrieves_failed_prefetch() -> None:
+    """Test that a failed next-page prefetch is awaited when pagination stops early."""
+    async def fake_request(url: str, headers: Dict[str, str] = None) -> str:
+        if url.endswith("page=2"):
+            raise ValueError("page 2 is unavailable")
+        if url.endswith("page=1"):
+            return "<html><body>list</body></html>"
+        # Item pages hang until the crawl is cancelled
+        await asyncio.sleep(10)
+    
+    unhandled = []
+    loop = asyncio.get_running_loop()
+    previous_handler = loop.get_exception_handler()
+    loop.set_exception_handler(lambda _, context: unhandled.append(context))
+    try:
+        request_manager = RequestManager()
+        with patch.object(request_manager, 'make_request', side_effect=fake_request):
+            spider = Spider(request_manager)
+            crawl = asyncio.ensure_future(spider.crawl_with_pagination(
+                base_url="http://example.com/list",
+                page_parser=lambda html: ["http://example.com/a"],
+                max_pages=3
+            ))
+            await asyncio.sleep(0.05)
+            crawl.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await crawl
+        
+        gc.collect()
+        await asyncio.sleep(0)
+    finally:
+        loop.set_exception_handler(previous_handler)
+    
+    assert not unhandled
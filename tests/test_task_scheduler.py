@@ -0,0 +1,58 @@
+"""
+Test cases for TaskScheduler.
+
+This module contains test cases for the TaskScheduler class, which is responsible
+for running tasks at their scheduled time.
+"""
+
+# Import built-in modules
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from crawler.task_manager.task_scheduler import TaskScheduler
+
+class RecordingScheduler(TaskScheduler):
+    """TaskScheduler that records executed tasks."""
+    
+    def __init__(self):
+        super().__init__()
+        self.executed: List[Dict[str, Any]] = []
+    
+    async def _execute_task(self, task: Dict[str, Any]):
+        self.executed.append(task)
+
+@pytest.mark.asyncio
+async def test_tasks_run_in_schedule_order() -> None:
+    """Test that due tasks run in schedule order and cancelled tasks are skipped."""
+    scheduler = RecordingScheduler()
+    runner = asyncio.ensure_future(scheduler.start())
+    
+    now = datetime.now()
+    scheduler.schedule_task({'name': 'second'}, now + timedelta(milliseconds=60))
+    scheduler.schedule_task({'name': 'first'}, now + timedelta(milliseconds=20))
+    cancelled_id = scheduler.schedule_task({'name': 'cancelled'}, now + timedelta(milliseconds=40))
+    assert scheduler.cancel_task(cancelled_id)
+    
+    await asyncio.sleep(0.2)
+    await scheduler.stop()
+    await asyncio.wait_for(runner, timeout=1)
+    
+    assert [task['name'] for task in scheduler.executed] == ['first', 'second']
+    assert scheduler.get_scheduled_tasks() == []
+
+def test_task_ids_stay_unique_after_cancel() -> None:
+    """Test that a cancelled task's ID is not reused by later tasks."""
+    scheduler = TaskScheduler()
+    when = datetime.now() + timedelta(hours=1)
+    first_id = scheduler.schedule_task({'name': 'first'}, when)
+    second_id = scheduler.schedule_task({'name': 'second'}, when)
+    assert scheduler.cancel_task(first_id)
+    
+    third_id = scheduler.schedule_task({'name': 'third'}, when)
+    assert len({first_id, second_id, third_id}) == 3
+    assert {task['task']['name'] for task in scheduler.get_scheduled_tasks()} == {'second', 'third'}